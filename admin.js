@@ -108,7 +108,7 @@ const showStatus = (msg, type = "info") => {
 // --- API Interactions ---
 const loadFiles = async () => {
   try {
-    const res = await fetch("/api/fs/list", { headers: setHeaders() });
+    const res = await fetch("api/fs/list", { headers: setHeaders() });
     checkAuth(res);
     const data = await res.json();
     renderFileList(data.files);
@@ -182,7 +182,7 @@ const openFile = async (path) => {
   if (monacoEl) monacoEl.style.display = "block";
 
   try {
-    const res = await fetch(`/api/fs/file?path=${encodeURIComponent(path)}`, {
+    const res = await fetch(`api/fs/file?path=${encodeURIComponent(path)}`, {
       headers: setHeaders(),
     });
     checkAuth(res);
@@ -220,7 +220,7 @@ const saveFile = async () => {
   saveBtn.textContent = "Saving...";
   
   try {
-    const res = await fetch(`/api/fs/file?path=${encodeURIComponent(currentFilePath)}`, {
+    const res = await fetch(`api/fs/file?path=${encodeURIComponent(currentFilePath)}`, {
       method: "POST",
       headers: setHeaders(),
       body: JSON.stringify({ content }),
@@ -247,7 +247,7 @@ const createFile = async (path, content = "") => {
   }
 
   try {
-    const res = await fetch(`/api/fs/file?path=${encodeURIComponent(path)}`, {
+    const res = await fetch(`api/fs/file?path=${encodeURIComponent(path)}`, {
       method: "POST",
       headers: setHeaders(),
       body: JSON.stringify({ content }),
@@ -280,7 +280,7 @@ const uploadFile = async (file, path) => {
   showStatus("Uploading...", "info");
 
   try {
-    const res = await fetch("/api/fs/upload", {
+    const res = await fetch("api/fs/upload", {
       method: "POST",
       headers: {
         Authorization: `Bearer ${getToken()}`,
@@ -310,7 +310,7 @@ document.getElementById("login-form").addEventListener("submit", async (e) => {
   loginMsg.textContent = "Verifying...";
   try {
     localStorage.setItem(TOKEN_KEY, token); // Optimistic save
-    const res = await fetch("/api/fs/list", { headers: setHeaders() });
+    const res = await fetch("api/fs/list", { headers: setHeaders() });
     if (res.ok) {
         showEditor();
     } else {
@@ -391,7 +391,7 @@ if (dropZone) {
 const storedToken = getToken();
 if (storedToken) {
     // Verify first
-    fetch("/api/fs/list", { headers: setHeaders() })
+    fetch("api/fs/list", { headers: setHeaders() })
         .then(res => {
             if(res.ok) showEditor();
             else showLogin();
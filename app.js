@@ -8,9 +8,12 @@ const MAP_POOL = [
   "Overpass",
 ];
 
+const CHANGES_POLL_MS = 30000;
+
 const state = {
   teams: {},
   matches: [],
+  version: null,
 };
 
 const tabButtons = document.querySelectorAll(".tab");
@@ -435,5 +438,67 @@ const renderStandings = () => {
   });
 };
 
+// Returns null when the site is served without server.py (plain static hosting).
+const fetchDataVersion = async () => {
+  try {
+    const res = await fetch("api/changes?since=-1");
+    if (!res.ok) return null;
+    const data = await res.json();
+    return Number.isInteger(data?.version) ? data.version : null;
+  } catch (error) {
+    return null;
+  }
+};
+
+const applyChanges = (changes) => {
+  const matchChanges = changes?.matches;
+  if (matchChanges) {
+    const deleted = new Set(matchChanges.deleted || []);
+    const updated = new Map((matchChanges.modified || []).map((match) => [match?.id, match]));
+    state.matches = state.matches
+      .filter((match) => !deleted.has(match?.id))
+      .map((match) => updated.get(match?.id) || match)
+      .concat(matchChanges.added || []);
+  }
+  const teamChanges = changes?.teams;
+  if (teamChanges) {
+    const teams = { ...state.teams, ...(teamChanges.added || {}), ...(teamChanges.modified || {}) };
+    (teamChanges.deleted || []).forEach((id) => delete teams[id]);
+    state.teams = teams;
+  }
+};
+
+const pollChanges = async () => {
+  try {
+    const res = await fetch(`api/changes?since=${state.version}`);
+    if (res.ok) {
+      const data = await res.json();
+      if (data?.full_reload) {
+        await loadData();
+      } else if (data?.changes && Object.keys(data.changes).length > 0) {
+        applyChanges(data.changes);
+        renderMatches();
+        renderStandings();
+      }
+      if (Number.isInteger(data?.version)) {
+        state.version = data.version;
+      }
+    }
+  } catch (error) {
+    console.warn("增量同步失败", error);
+  }
+  setTimeout(pollChanges, CHANGES_POLL_MS);
+};
+
+const initData = async () => {
+  // Take the version before the data so no change can slip in between.
+  const version = await fetchDataVersion();
+  await loadData();
+  if (version !== null) {
+    state.version = version;
+    setTimeout(pollChanges, CHANGES_POLL_MS);
+  }
+};
+
 initTabs();
-loadData();
+initData();
@@ -0,0 +1,4 @@
+"""Benchmarks and synthetic data for server.py.
+
+Run ``python -m bench --help`` from the repository root.
+"""
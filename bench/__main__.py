@@ -0,0 +1,216 @@
+"""Reproducible micro-benchmarks for server.py on a synthetic league.
+
+Example::
+
+    python -m bench --teams 16 --matches 240 --maps 3 --out bench.json
+    python -m bench --compare bench.json   # exit 1 when a p50 regresses
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from .synth import generate_league
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+SITE_SUFFIXES = {".html", ".js", ".css"}
+TOKEN_HEADERS = {"X-Admin-Token": os.environ.get("BHML_ADMIN_TOKEN", "dev-token")}
+
+
+def measure(fn: Callable[[], Any], repeat: int, warmup: int = 3) -> Dict[str, float]:
+    for _ in range(warmup):
+        fn()
+    samples: List[float] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {
+        "runs": repeat,
+        "mean_ms": statistics.fmean(samples),
+        "p50_ms": samples[len(samples) // 2],
+        "p95_ms": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        "min_ms": samples[0],
+    }
+
+
+def build_site(root: Path, args: argparse.Namespace) -> None:
+    for path in REPO_DIR.iterdir():
+        if path.is_file() and path.suffix in SITE_SUFFIXES:
+            shutil.copy2(path, root / path.name)
+    teams, matches = generate_league(args.teams, args.matches, args.maps, args.players, args.seed)
+    data_dir = root / "data"
+    data_dir.mkdir()
+    for name, doc in (("teams.json", teams), ("matches.json", matches)):
+        (data_dir / name).write_text(json.dumps(doc, ensure_ascii=False, indent=2), encoding="utf-8")
+    (root / "assets").mkdir()
+    (root / "assets" / "schedule.png").write_bytes(os.urandom(512 * 1024))
+    # Wide, moderately deep tree for the admin file browser.
+    for i in range(args.fs_files):
+        directory = root / "assets" / f"d{i % 50:02d}" / f"e{i % 7}"
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / f"f{i}.png").write_bytes(b"\x89PNG")
+
+
+def point_server_at(server: Any, root: Path) -> None:
+    server.BASE_DIR = root
+    server.DATA_DIR = root / "data"
+    server.STORE = server.DataStore(server.DATA_DIR)
+    server.SEASONS = server.SeasonRegistry()
+    server.SEASONS.add("", root, server.STORE)
+    server.STATIC = server.StaticFiles(root)
+    # One test client hammering every route would otherwise trip the per-client limits.
+    server.LIMITER.enabled = False
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    sys.path.insert(0, str(REPO_DIR))
+    import server
+    from league.storage import read_json, write_json
+
+    results: Dict[str, Dict[str, float]] = {}
+    with tempfile.TemporaryDirectory(prefix="bhml-bench-") as tmp:
+        root = Path(tmp)
+        build_site(root, args)
+        point_server_at(server, root)
+        matches_path = root / "data" / "matches.json"
+        matches_doc = read_json(matches_path)
+        teams_doc = read_json(root / "data" / "teams.json")
+        client = server.app.test_client()
+
+        results["io.read_json"] = measure(lambda: read_json(matches_path), args.repeat)
+        scratch = root / "data" / "scratch.json"
+        results["io.write_json"] = measure(lambda: write_json(scratch, matches_doc), args.repeat)
+        results["standings"] = measure(
+            lambda: server._compute_standings(teams_doc["teams"], matches_doc["matches"]), args.repeat
+        )
+        # The outlook route caches per data version, so time the simulation itself too.
+        results["simulate_outlook"] = measure(
+            lambda: server._simulate_outlook(teams_doc["teams"], matches_doc["matches"], server.SIMULATIONS, seed=0),
+            max(3, args.repeat // 10),
+        )
+
+        # Current static layer against plain send_from_directory, small and large file.
+        for filename in ("app.js", "assets/schedule.png"):
+            with server.app.test_request_context(f"/{filename}"):
+                results[f"static.send_from_directory {filename}"] = measure(
+                    lambda: server.send_from_directory(root, filename).close(), args.repeat
+                )
+                results[f"static.cached {filename}"] = measure(
+                    lambda: server.STATIC.serve(filename).close(), args.repeat
+                )
+
+        first_id = matches_doc["matches"][0]["id"]
+        team_id = next(iter(teams_doc["teams"]))
+        query = teams_doc["teams"][team_id].get("name", team_id)[:2]
+        routes = [
+            ("GET /", "get", "/", {}),
+            ("GET /app.js", "get", "/app.js", {}),
+            ("GET /assets/schedule.png", "get", "/assets/schedule.png", {}),
+            ("GET /data/matches.json", "get", "/data/matches.json", {}),
+            ("GET /match.html", "get", f"/match.html?id={first_id}", {}),
+            ("GET /api/matches", "get", "/api/matches", {}),
+            ("GET /api/matches?query", "get",
+             f"/api/matches?status=completed&team={team_id}&fields=id,time,teams,score,status&limit=20", {}),
+            ("GET /api/teams", "get", "/api/teams", {"headers": TOKEN_HEADERS}),
+            ("GET /api/standings", "get", "/api/standings", {}),
+            ("GET /api/standings/outlook", "get", "/api/standings/outlook", {}),
+            ("GET /api/search", "get", f"/api/search?q={query}", {}),
+            ("GET /api/ratings", "get", "/api/ratings", {}),
+            ("GET /api/ratings?match", "get", f"/api/ratings?match={first_id}", {}),
+            ("GET /api/analytics/maps", "get", "/api/analytics/maps", {}),
+            ("GET /api/export/player_stats", "get", "/api/export/player_stats", {}),
+            ("GET /api/changes", "get", "/api/changes?since=0", {}),
+            ("GET /api/journal", "get", "/api/journal?since=0", {"headers": TOKEN_HEADERS}),
+            ("GET /api/history", "get", "/api/history", {"headers": TOKEN_HEADERS}),
+            ("GET /api/fs/list", "get", "/api/fs/list", {"headers": TOKEN_HEADERS}),
+            ("GET /api/fs/file", "get", "/api/fs/file?path=index.html", {"headers": TOKEN_HEADERS}),
+            ("GET /metrics", "get", "/metrics", {}),
+            ("POST /api/matches", "post", "/api/matches", {"headers": TOKEN_HEADERS, "json": matches_doc}),
+        ]
+        for name, method, path, kwargs in routes:
+            def call(method=method, path=path, kwargs=kwargs, name=name):
+                response = getattr(client, method)(path, **kwargs)
+                if response.status_code >= 400:
+                    raise RuntimeError(f"{name}: HTTP {response.status_code}")
+                # Drain streamed bodies (the stats export) so their generation is timed too.
+                response.get_data()
+                response.close()
+            # fs list walks the whole tree; fewer runs keep the suite quick.
+            repeat = max(3, args.repeat // 10) if path.startswith("/api/fs/list") else args.repeat
+            results[name] = measure(call, repeat)
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "commit": _git_rev(),
+            "params": {k: v for k, v in vars(args).items() if k not in {"out", "compare", "threshold"}},
+            "matches_bytes": len(json.dumps(matches_doc, ensure_ascii=False, indent=2).encode("utf-8")),
+        },
+        "results": results,
+    }
+
+
+def _git_rev() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    regressions = []
+    for name, result in current["results"].items():
+        old = baseline.get("results", {}).get(name)
+        if not old or not old.get("p50_ms"):
+            continue
+        ratio = result["p50_ms"] / old["p50_ms"]
+        marker = "REGRESSION" if ratio > 1 + threshold else ""
+        print(f"{name:<28} {old['p50_ms']:9.3f} -> {result['p50_ms']:9.3f} ms  x{ratio:5.2f} {marker}", file=sys.stderr)
+        if marker:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m bench", description=__doc__.splitlines()[0])
+    parser.add_argument("--teams", type=int, default=12)
+    parser.add_argument("--matches", type=int, default=120)
+    parser.add_argument("--maps", type=int, default=1, help="maps per match (bo1 = 1, bo3 = 3)")
+    parser.add_argument("--players", type=int, default=5)
+    parser.add_argument("--fs-files", type=int, default=2000, help="files created for the fs list benchmark")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--out", help="write JSON results here instead of stdout")
+    parser.add_argument("--compare", help="baseline JSON from an earlier run")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed p50 slowdown before failing")
+    args = parser.parse_args(argv)
+
+    report = run(args)
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.out:
+        Path(args.out).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        if compare(report, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,355 @@
+"""Match-night load generator for a running server.py.
+
+Viewers arrive in bursts and load the public pages the way app.js and match.js do
+(index, then often a match page with its ratings), then poll ``/api/changes`` every
+30 s and reload what a change touches; a few admins keep reading
+``/api/matches`` and, only with ``--write``, POST random scores back to it, which
+rewrites the target's match data, so never pass it against a live site. Every
+request can be recorded as one JSON line and replayed later with the same timing.
+All virtual users share one address, so leave the per-client limits of
+``BHML_RATE_LIMITS`` off unless the limiter itself is under test::
+
+    python -m bench.loadtest --url http://127.0.0.1:8000 --duration 60 --write --record night.jsonl
+    python -m bench.loadtest --url http://127.0.0.1:8000 --replay night.jsonl --speed 2
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+# What the browser fetches for each page, in order (index.html/app.js and match.html/match.js).
+VIEWER_PAGE = [
+    "/", "/styles.css?v=1.2", "/app.js?v=1.2", "/assets/logo.jpg", "/assets/schedule1.PNG",
+    "/api/changes?since=-1", "/data/teams.json", "/data/matches.json",
+]
+MATCH_PAGE = ["/match.html?id={id}", "/styles.css?v=1.1", "/match.js?v=1.1", "/api/changes?since=-1"]
+# loadMatch(): run on open and again whenever a poll reports the match (or any team) changed.
+MATCH_DATA = ["/data/teams.json", "/data/matches.json", "/api/ratings?match={id}"]
+# CHANGES_POLL_MS in app.js and match.js.
+CHANGES_POLL_SECONDS = 30.0
+
+
+class HttpConnection:
+    """Minimal keep-alive HTTP/1.1 client; enough for server.py, no dependencies."""
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def _connect(self) -> None:
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except OSError:
+                pass
+            self._reader = self._writer = None
+
+    async def request(
+        self, method: str, path: str, body: Optional[bytes] = None, headers: Optional[Dict[str, str]] = None
+    ) -> Tuple[int, int, bytes]:
+        for attempt in (0, 1):
+            if self._writer is None:
+                await self._connect()
+            try:
+                return await self._roundtrip(method, path, body, headers or {})
+            except (ConnectionError, asyncio.IncompleteReadError):
+                # Server closed an idle keep-alive connection; retry once on a fresh one.
+                await self.close()
+                if attempt:
+                    raise
+        raise AssertionError("unreachable")
+
+    async def _roundtrip(
+        self, method: str, path: str, body: Optional[bytes], headers: Dict[str, str]
+    ) -> Tuple[int, int, bytes]:
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {self.host}:{self.port}", "Connection: keep-alive"]
+        lines += [f"{k}: {v}" for k, v in headers.items()]
+        if body is not None:
+            lines.append(f"Content-Length: {len(body)}")
+        self._writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + (body or b""))
+        await self._writer.drain()
+
+        status_line = await self._reader.readuntil(b"\r\n")
+        status = int(status_line.split()[1])
+        response_headers: Dict[str, str] = {}
+        while True:
+            line = await self._reader.readuntil(b"\r\n")
+            if line == b"\r\n":
+                break
+            key, _, value = line.decode("latin-1").partition(":")
+            response_headers[key.strip().lower()] = value.strip()
+
+        if response_headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await self._reader.readuntil(b"\r\n")).split(b";")[0], 16)
+                if size == 0:
+                    await self._reader.readuntil(b"\r\n")
+                    break
+                chunks.append(await self._reader.readexactly(size))
+                await self._reader.readexactly(2)
+            payload = b"".join(chunks)
+        elif "content-length" in response_headers:
+            payload = await self._reader.readexactly(int(response_headers["content-length"]))
+        elif method == "HEAD" or status in (204, 304):
+            payload = b""
+        else:
+            payload = await self._reader.read()
+            await self.close()
+            return status, len(payload), payload
+
+        if response_headers.get("connection", "").lower() == "close" or status_line.startswith(b"HTTP/1.0"):
+            await self.close()
+        return status, len(payload), payload
+
+
+class Recorder:
+    def __init__(self, path: Optional[str]):
+        self.started = time.monotonic()
+        self.samples: List[Dict[str, Any]] = []
+        self._fh = open(path, "w", encoding="utf-8") if path else None
+
+    def add(self, user: str, kind: str, method: str, path: str, status: int, ms: float, nbytes: int) -> None:
+        sample = {
+            "t": round(time.monotonic() - self.started, 4),
+            "user": user,
+            "kind": kind,
+            "method": method,
+            "path": path,
+            "status": status,
+            "ms": round(ms, 3),
+            "bytes": nbytes,
+        }
+        self.samples.append(sample)
+        if self._fh is not None:
+            self._fh.write(json.dumps(sample, ensure_ascii=False) + "\n")
+
+    def close(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+
+
+async def _timed(
+    conn: HttpConnection, recorder: Recorder, user: str, kind: str, method: str, path: str, **kwargs: Any
+) -> Tuple[int, bytes]:
+    started = time.perf_counter()
+    try:
+        status, nbytes, payload = await conn.request(method, path, **kwargs)
+    except (OSError, asyncio.IncompleteReadError, ValueError):
+        status, nbytes, payload = 0, 0, b""
+        await conn.close()
+    recorder.add(user, kind, method, path, status, (time.perf_counter() - started) * 1000, nbytes)
+    return status, payload
+
+
+async def viewer(name: str, args: argparse.Namespace, recorder: Recorder, match_ids: List[str], deadline: float) -> None:
+    rng = random.Random(name)
+    conn = HttpConnection(args.host, args.port)
+
+    async def load(kind: str, paths: List[str], match_id: Optional[str] = None) -> int:
+        version = -1
+        for path in paths:
+            status, payload = await _timed(conn, recorder, name, kind, "GET", path.format(id=match_id))
+            if path.startswith("/api/changes") and status == 200:
+                version = json.loads(payload).get("version", version)
+        return version
+
+    try:
+        version = await load("page", VIEWER_PAGE)
+        match_id = rng.choice(match_ids) if match_ids and rng.random() < 0.6 else None
+        if match_id is not None:
+            version = await load("match", MATCH_PAGE, match_id)
+            await load("match", MATCH_DATA, match_id)
+        while True:
+            # Stop at the deadline rather than sleeping through one more 30 s poll past it.
+            delay = args.poll_interval * rng.uniform(0.8, 1.2)
+            if time.monotonic() + delay > deadline:
+                break
+            await asyncio.sleep(delay)
+            status, payload = await _timed(conn, recorder, name, "poll", "GET", f"/api/changes?since={version}")
+            if status != 200:
+                continue
+            body = json.loads(payload)
+            changes = body.get("changes") or {}
+            if match_id is not None:
+                matches = changes.get("matches") or {}
+                touched = any(
+                    isinstance(m, dict) and m.get("id") == match_id
+                    for m in matches.get("added", []) + matches.get("modified", [])
+                )
+                if body.get("full_reload") or touched or changes.get("teams"):
+                    await load("reload", MATCH_DATA, match_id)
+            elif body.get("full_reload"):
+                await load("reload", MATCH_DATA[:2])
+            version = body.get("version", version)
+    finally:
+        await conn.close()
+
+
+async def admin(name: str, args: argparse.Namespace, recorder: Recorder, deadline: float) -> None:
+    rng = random.Random(name)
+    conn = HttpConnection(args.host, args.port)
+    headers = {"X-Admin-Token": args.token, "Content-Type": "application/json"}
+    try:
+        while time.monotonic() < deadline:
+            status, payload = await _timed(conn, recorder, name, "admin_get", "GET", "/api/matches")
+            if status == 200 and args.write:
+                doc = json.loads(payload)
+                live = [m for m in doc.get("matches", []) if isinstance(m, dict)]
+                if live:
+                    match = rng.choice(live)
+                    match.setdefault("score", {})["a"] = str(rng.randint(0, 13))
+                body = json.dumps(doc, ensure_ascii=False).encode("utf-8")
+                await _timed(conn, recorder, name, "admin_post", "POST", "/api/matches", body=body, headers=headers)
+            await asyncio.sleep(args.admin_interval * rng.uniform(0.5, 1.5))
+    finally:
+        await conn.close()
+
+
+async def _match_ids(args: argparse.Namespace) -> List[str]:
+    conn = HttpConnection(args.host, args.port)
+    try:
+        status, _, payload = await conn.request("GET", "/data/matches.json")
+    finally:
+        await conn.close()
+    if status != 200:
+        return []
+    return [m["id"] for m in json.loads(payload).get("matches", []) if isinstance(m, dict) and m.get("id")]
+
+
+async def generate(args: argparse.Namespace, recorder: Recorder) -> None:
+    match_ids = await _match_ids(args)
+    deadline = time.monotonic() + args.duration
+    tasks = [asyncio.create_task(admin(f"admin-{i}", args, recorder, deadline)) for i in range(args.admins)]
+    # Viewers arrive in bursts (a stream going live, a match ending) rather than evenly.
+    arrived = 0
+    while arrived < args.viewers and time.monotonic() < deadline:
+        burst = min(args.viewers - arrived, max(1, int(args.viewers * random.uniform(0.05, 0.2))))
+        for i in range(burst):
+            tasks.append(asyncio.create_task(viewer(f"viewer-{arrived + i}", args, recorder, match_ids, deadline)))
+        arrived += burst
+        await asyncio.sleep(args.duration / 10 * random.uniform(0.2, 1.0))
+    await asyncio.gather(*tasks)
+
+
+async def replay(args: argparse.Namespace, recorder: Recorder) -> None:
+    with open(args.replay, encoding="utf-8") as fh:
+        entries = [json.loads(line) for line in fh if line.strip()]
+    by_user: Dict[str, List[Dict[str, Any]]] = {}
+    for entry in entries:
+        by_user.setdefault(entry["user"], []).append(entry)
+    started = time.monotonic()
+
+    async def run_user(user: str, items: List[Dict[str, Any]]) -> None:
+        conn = HttpConnection(args.host, args.port)
+        headers = {"X-Admin-Token": args.token, "Content-Type": "application/json"}
+        body: Optional[bytes] = None
+        try:
+            for item in items:
+                delay = started + item["t"] / args.speed - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                if item["method"] == "POST":
+                    # Bodies are not recorded; write back the document this admin last read. Without
+                    # one (or without --write) there is nothing sensible to send, so skip the POST.
+                    if body is not None and args.write:
+                        await _timed(conn, recorder, user, item["kind"], "POST", item["path"], body=body, headers=headers)
+                    continue
+                status, payload = await _timed(conn, recorder, user, item["kind"], item["method"], item["path"])
+                if item["kind"] == "admin_get" and status == 200:
+                    body = payload
+        finally:
+            await conn.close()
+
+    await asyncio.gather(*(run_user(user, items) for user, items in by_user.items()))
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * pct / 100))]
+
+
+def summarize(samples: List[Dict[str, Any]], elapsed: float) -> Dict[str, Any]:
+    def stats(group: List[Dict[str, Any]]) -> Dict[str, Any]:
+        latencies = sorted(s["ms"] for s in group)
+        errors = sum(1 for s in group if s["status"] == 0 or s["status"] >= 400)
+        return {
+            "requests": len(group),
+            "rps": len(group) / elapsed if elapsed else 0.0,
+            "error_rate": errors / len(group) if group else 0.0,
+            "p50_ms": _percentile(latencies, 50),
+            "p90_ms": _percentile(latencies, 90),
+            "p99_ms": _percentile(latencies, 99),
+            "max_ms": latencies[-1] if latencies else 0.0,
+            "bytes": sum(s["bytes"] for s in group),
+        }
+
+    kinds: Dict[str, List[Dict[str, Any]]] = {}
+    statuses: Dict[str, int] = {}
+    for sample in samples:
+        kinds.setdefault(sample["kind"], []).append(sample)
+        statuses[str(sample["status"])] = statuses.get(str(sample["status"]), 0) + 1
+    return {
+        "elapsed_s": elapsed,
+        "total": stats(samples),
+        "by_kind": {kind: stats(group) for kind, group in sorted(kinds.items())},
+        "status_counts": statuses,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m bench.loadtest", description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds of generated traffic")
+    parser.add_argument("--viewers", type=int, default=200)
+    parser.add_argument("--admins", type=int, default=2)
+    parser.add_argument(
+        "--poll-interval", type=float, default=CHANGES_POLL_SECONDS, help="seconds between viewer change polls"
+    )
+    parser.add_argument("--admin-interval", type=float, default=3.0, help="seconds between admin score posts")
+    parser.add_argument("--token", default=os.environ.get("BHML_ADMIN_TOKEN", "dev-token"))
+    parser.add_argument(
+        "--write", action="store_true", help="let admins POST score changes (rewrites the target's match data)"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--record", help="write every request as a JSON line to this file")
+    parser.add_argument("--replay", help="replay a file written by --record instead of generating traffic")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed multiplier")
+    parser.add_argument("--out", help="write the JSON summary here instead of stdout")
+    args = parser.parse_args(argv)
+
+    url = urlsplit(args.url)
+    args.host, args.port = url.hostname or "127.0.0.1", url.port or 80
+    random.seed(args.seed)
+
+    recorder = Recorder(args.record)
+    started = time.monotonic()
+    try:
+        asyncio.run(replay(args, recorder) if args.replay else generate(args, recorder))
+    finally:
+        recorder.close()
+    summary = summarize(recorder.samples, time.monotonic() - started)
+    text = json.dumps(summary, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            fh.write(text + "\n")
+    else:
+        print(text)
+    return 0 if summary["total"]["error_rate"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+"""Synthetic league generator shaped like data/teams.json and data/matches.json."""
+
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Tuple
+
+MAP_POOL = ["Dust 2", "Mirage", "Anubis", "Ancient", "Nuke", "Inferno", "Overpass"]
+STAGES = ["第一阶段", "第二阶段", "季后赛"]
+
+_SCHOOLS = ["北师大", "人大", "清华", "北大", "首师大", "北京", "海淀", "朝阳", "西城", "东城", "实验", "育才"]
+_SCHOOL_SUFFIXES = ["附中", "二附中", "实验中学", "中学", "外国语学校", "一中"]
+_CJK_SYLLABLES = "无敌捷风大王白稲妻暴头小子胡图图苏幽凌起司卷轴涉谷突破手散装空气紫月魔彩虹糖枪神宇治顶针海琳继伟豆芽"
+_LATIN_HANDLES = ["ch0pper", "walkers", "m0SEsy", "Lpm3k", "sharrrb", "henryz", "w10sper", "Zont1X", "bullet", "Nightmare"]
+_SYMBOLS = ["", "", "", "♡", "♪", "&dom", "."]
+
+
+def _player_name(rng: random.Random, taken: set) -> str:
+    while True:
+        style = rng.random()
+        if style < 0.4:
+            name = "".join(rng.choice(_CJK_SYLLABLES) for _ in range(rng.randint(2, 6)))
+            if rng.random() < 0.3:
+                name += str(rng.randint(1, 999))
+        elif style < 0.7:
+            name = rng.choice(_LATIN_HANDLES) + rng.choice(_SYMBOLS) + str(rng.randint(0, 99))
+        elif style < 0.85:
+            name = "".join(rng.choice(_CJK_SYLLABLES) for _ in range(2)) + rng.choice(_LATIN_HANDLES)
+        else:
+            name = f"用户{rng.randint(1000000, 9999999)}"
+        if name not in taken:
+            taken.add(name)
+            return name
+
+
+def generate_teams(rng: random.Random, count: int, players: int, substitutes: int = 1) -> Dict[str, Any]:
+    taken: set = set()
+    teams: Dict[str, Any] = {}
+    for i in range(count):
+        team_id = f"t{i:03d}"
+        name = f"{rng.choice(_SCHOOLS)}{rng.choice(_SCHOOL_SUFFIXES)}"
+        if rng.random() < 0.3:
+            name += f" {chr(ord('A') + i % 3)}队"
+        teams[team_id] = {
+            "name": name,
+            "members": [_player_name(rng, taken) for _ in range(players)],
+            "substitutes": [_player_name(rng, taken) for _ in range(substitutes)],
+            "logo": f"assets/logos/{team_id}.png",
+        }
+    return {"notes": "synthetic", "teams": teams}
+
+
+def _veto(rng: random.Random, team_a: str, team_b: str, picks: int) -> Tuple[List[Dict[str, Any]], List[str]]:
+    pool = MAP_POOL[:]
+    rng.shuffle(pool)
+    banpick: List[Dict[str, Any]] = []
+    chosen: List[str] = []
+    bans = len(pool) - picks
+    for step in range(len(pool)):
+        team = team_a if step % 2 == 0 else team_b
+        game_map = pool[step]
+        if step < bans:
+            banpick.append({"team": team, "action": "ban", "map": game_map})
+        else:
+            banpick.append({"team": team, "action": "pick", "map": game_map})
+            side_team = team_b if team == team_a else team_a
+            banpick.append({"team": side_team, "action": "side", "side": rng.choice(["CT", "T"]), "map": game_map})
+            chosen.append(game_map)
+    return banpick, chosen
+
+
+def _map_result(rng: random.Random, team_a: str, team_b: str, roster: Dict[str, List[str]], name: str) -> Dict[str, Any]:
+    winner_rounds = 13
+    loser_rounds = rng.randint(0, 11)
+    a_wins = rng.random() < 0.5
+    score = {"a": winner_rounds if a_wins else loser_rounds, "b": loser_rounds if a_wins else winner_rounds}
+    rounds = score["a"] + score["b"]
+    stats = []
+    for team in (team_a, team_b):
+        for player in roster[team]:
+            stats.append({
+                "player": player,
+                "team": team,
+                "k": rng.randint(0, rounds + 5),
+                "d": rng.randint(max(0, rounds // 3), rounds),
+                "a": rng.randint(0, rounds // 2),
+                "adr": round(rng.uniform(30, 130), 1),
+                "rating": 0.00,
+            })
+    return {"name": name, "score": score, "player_stats": stats}
+
+
+def generate_matches(
+    rng: random.Random,
+    teams: Dict[str, Any],
+    count: int,
+    maps_per_match: int = 1,
+    completed_ratio: float = 0.7,
+) -> Dict[str, Any]:
+    ids = list(teams["teams"])
+    roster = {team_id: team["members"] for team_id, team in teams["teams"].items()}
+    start = datetime(2026, 2, 6, 20, 0, tzinfo=timezone(timedelta(hours=8)))
+    matches = []
+    for i in range(count):
+        team_a, team_b = rng.sample(ids, 2)
+        when = start + timedelta(hours=2 * (i % 3) + 24 * (i // 3))
+        match: Dict[str, Any] = {
+            "id": f"m-{when:%Y-%m-%d-%H%M}-{i}",
+            "stage": STAGES[min(len(STAGES) - 1, i * len(STAGES) // max(1, count))],
+            "status": "completed" if i < count * completed_ratio else "upcoming",
+            "format": f"bo{maps_per_match}",
+            "time": when.isoformat(),
+            "teams": {"a": team_a, "b": team_b},
+        }
+        if match["status"] == "completed":
+            banpick, chosen = _veto(rng, team_a, team_b, maps_per_match)
+            maps = [_map_result(rng, team_a, team_b, roster, name) for name in chosen]
+            if maps_per_match == 1:
+                score = maps[0]["score"]
+                match["score"] = {"a": str(score["a"]), "b": str(score["b"])}
+            else:
+                won_a = sum(1 for m in maps if m["score"]["a"] > m["score"]["b"])
+                match["score"] = {"a": str(won_a), "b": str(len(maps) - won_a)}
+            match["replay"] = f"https://www.bilibili.com/video/BV{rng.getrandbits(40):010x}/"
+            match["banpick"] = banpick
+            match["maps"] = maps
+        else:
+            match["score"] = {"a": "tba", "b": "tba"}
+            match["banpick"] = []
+            match["maps"] = []
+        matches.append(match)
+    return {"notes": "synthetic", "matches": matches, "map_pool": MAP_POOL}
+
+
+def generate_league(
+    teams: int = 8,
+    matches: int = 60,
+    maps_per_match: int = 1,
+    players: int = 5,
+    seed: int = 0,
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    rng = random.Random(seed)
+    teams_doc = generate_teams(rng, teams, players)
+    return teams_doc, generate_matches(rng, teams_doc, matches, maps_per_match)
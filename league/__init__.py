@@ -0,0 +1 @@
+"""Storage, derived indexes and metrics behind server.py."""
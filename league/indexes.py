@@ -0,0 +1,626 @@
+"""Indexes derived from the data files, rebuilt by data listeners as the files change.
+
+Request threads read them without a lock, so an update never changes a published
+structure in place: it builds the new one aside and swaps it in.
+"""
+
+import bisect
+import re
+import unicodedata
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .storage import DataStore, data_listener
+
+# Match times carry +08:00; query bounds without an offset are read in the same zone.
+LEAGUE_TZ = timezone(timedelta(hours=8))
+
+
+def parse_time(value: Any) -> Optional[float]:
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=LEAGUE_TZ)
+    return parsed.timestamp()
+
+
+def to_number(value: Any) -> Optional[float]:
+    if value is None or value == "" or isinstance(value, bool):
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if number != number else number
+
+
+class MatchIndex:
+    """Matches sorted by (time, id) with posting lists for status, team and stage.
+
+    Posting lists hold positions into ``rows`` in sort order; matches without a
+    parseable time sort last, as in the schedule view.
+    """
+
+    def __init__(self, matches: List[Any]):
+        keyed = []
+        for match in matches:
+            if isinstance(match, dict):
+                ts = parse_time(match.get("time"))
+                keyed.append(((ts if ts is not None else float("inf"), str(match.get("id", ""))), match))
+        keyed.sort(key=lambda pair: pair[0])
+        self.keys = [key for key, _ in keyed]
+        self.rows = [match for _, match in keyed]
+        self.by_status: Dict[str, List[int]] = {}
+        self.by_team: Dict[str, List[int]] = {}
+        self.by_stage: Dict[str, List[int]] = {}
+        for pos, match in enumerate(self.rows):
+            self.by_status.setdefault(str(match.get("status", "")), []).append(pos)
+            self.by_stage.setdefault(str(match.get("stage", "")), []).append(pos)
+            teams = match.get("teams") if isinstance(match.get("teams"), dict) else {}
+            for team_id in {teams.get("a"), teams.get("b")} - {None}:
+                self.by_team.setdefault(str(team_id), []).append(pos)
+
+    def query(
+        self,
+        status: Optional[List[str]] = None,
+        team: Optional[str] = None,
+        stage: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        after: Optional[Tuple[float, str]] = None,
+        descending: bool = False,
+    ) -> List[int]:
+        lo = bisect.bisect_left(self.keys, (since, "")) if since is not None else 0
+        hi = bisect.bisect_right(self.keys, (until, "\uffff")) if until is not None else len(self.keys)
+        if after is not None:
+            if descending:
+                hi = min(hi, bisect.bisect_left(self.keys, after))
+            else:
+                lo = max(lo, bisect.bisect_right(self.keys, after))
+        postings = []
+        if status:
+            postings.append(sorted({pos for s in status for pos in self.by_status.get(s, [])}))
+        if team is not None:
+            postings.append(self.by_team.get(team, []))
+        if stage is not None:
+            postings.append(self.by_stage.get(stage, []))
+        if postings:
+            postings.sort(key=len)
+            # Narrow the shortest list to the time window, then test membership in the rest.
+            first = postings[0]
+            candidates = first[bisect.bisect_left(first, lo):bisect.bisect_left(first, hi)]
+            others = [set(p) for p in postings[1:]]
+            positions = [pos for pos in candidates if all(pos in other for other in others)]
+        else:
+            positions = list(range(lo, hi))
+        return positions[::-1] if descending else positions
+
+
+@data_listener
+def _index_matches(store: "DataStore", name: str, old: Optional[Dict[str, Any]], new: Dict[str, Any]) -> None:
+    if name == "matches.json":
+        matches = new.get("matches")
+        store.derived["matches"] = MatchIndex(matches if isinstance(matches, list) else [])
+
+
+def match_index(store: "DataStore") -> MatchIndex:
+    store.read("matches.json")
+    return store.derived.get("matches") or MatchIndex([])
+
+
+_CJK_RUN = re.compile(r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uac00-\ud7af]+")
+_WORD_RUN = re.compile(r"[^\W_]+")
+
+
+def _search_terms(text: str, query: bool = False) -> Tuple[set, set]:
+    """Split text into CJK character n-grams and Latin/digit words.
+
+    Indexed text yields CJK unigrams and bigrams; a query only needs the bigrams
+    (or the lone character). Words also get a compacted form so handles with
+    symbols in them ("L♡1cal") match when typed without the symbol.
+    """
+    text = unicodedata.normalize("NFKC", text).casefold()
+    grams: set = set()
+    for run in _CJK_RUN.findall(text):
+        if not query or len(run) == 1:
+            grams.update(run)
+        grams.update(run[i:i + 2] for i in range(len(run) - 1))
+    rest = _CJK_RUN.sub(" ", text)
+    words = set(_WORD_RUN.findall(rest))
+    if not query and len(words) > 1:
+        words.add("".join(_WORD_RUN.findall(rest)))
+    return grams, words
+
+
+class SearchIndex:
+    """Inverted index over teams, players and matches for ``/api/search``.
+
+    CJK names are indexed as character uni/bigrams, Latin handles as words looked
+    up by prefix. Team changes rebuild everything (a few dozen docs); match changes
+    only re-index the matches whose content differs. Searches run without a lock,
+    so an index is never changed once published: updates go to a :meth:`copy`.
+    """
+
+    def __init__(self):
+        self._reset()
+
+    def _reset(self) -> None:
+        self.docs: Dict[str, Dict[str, Any]] = {}
+        self._doc_terms: Dict[str, List[str]] = {}
+        self._postings: Dict[str, set] = {}
+        self._words: List[str] = []
+        self.teams: Dict[str, Any] = {}
+        self.matches: Dict[str, Dict[str, Any]] = {}
+        # player name -> {"teams": {...}, "matches": {...}}
+        self._player_refs: Dict[str, Dict[str, set]] = {}
+
+    def copy(self) -> "SearchIndex":
+        clone = SearchIndex()
+        clone.docs = {doc_id: dict(doc) for doc_id, doc in self.docs.items()}
+        clone._doc_terms = dict(self._doc_terms)
+        clone._postings = {term: set(posting) for term, posting in self._postings.items()}
+        clone._words = list(self._words)
+        clone.teams = self.teams
+        clone.matches = dict(self.matches)
+        clone._player_refs = {
+            name: {kind: set(refs) for kind, refs in entry.items()} for name, entry in self._player_refs.items()
+        }
+        return clone
+
+    def _add(self, doc_id: str, text: str, doc: Dict[str, Any]) -> None:
+        self._remove(doc_id)
+        grams, words = _search_terms(text)
+        terms = [f"g:{t}" for t in grams] + [f"w:{t}" for t in words]
+        for term in terms:
+            self._postings.setdefault(term, set()).add(doc_id)
+        for word in words:
+            pos = bisect.bisect_left(self._words, word)
+            if pos == len(self._words) or self._words[pos] != word:
+                self._words.insert(pos, word)
+        self.docs[doc_id] = doc
+        self._doc_terms[doc_id] = terms
+
+    def _remove(self, doc_id: str) -> None:
+        for term in self._doc_terms.pop(doc_id, []):
+            posting = self._postings.get(term)
+            if posting is not None:
+                posting.discard(doc_id)
+                if not posting:
+                    del self._postings[term]
+                    if term.startswith("w:"):
+                        pos = bisect.bisect_left(self._words, term[2:])
+                        if pos < len(self._words) and self._words[pos] == term[2:]:
+                            del self._words[pos]
+        self.docs.pop(doc_id, None)
+
+    def _team_name(self, team_id: Any) -> str:
+        team = self.teams.get(team_id)
+        return team.get("name", str(team_id)) if isinstance(team, dict) else str(team_id or "")
+
+    def _ref_player(self, name: Any, kind: str, ref: str, add: bool) -> None:
+        if not isinstance(name, str) or not name:
+            return
+        refs = self._player_refs.setdefault(name, {"teams": set(), "matches": set()})
+        (refs[kind].add if add else refs[kind].discard)(ref)
+        doc_id = f"player:{name}"
+        if not refs["teams"] and not refs["matches"]:
+            del self._player_refs[name]
+            self._remove(doc_id)
+        elif doc_id in self.docs:
+            self.docs[doc_id].update(teams=sorted(refs["teams"]), matches=len(refs["matches"]))
+        else:
+            self._add(doc_id, name, {
+                "type": "player", "id": name, "name": name,
+                "teams": sorted(refs["teams"]), "matches": len(refs["matches"]),
+            })
+
+    def _match_players(self, match: Dict[str, Any]) -> Dict[str, str]:
+        players = {}
+        for game_map in match.get("maps") or []:
+            for row in (game_map or {}).get("player_stats") or []:
+                if isinstance(row, dict) and isinstance(row.get("player"), str):
+                    players[row["player"]] = row.get("team")
+        return players
+
+    def _add_match(self, match_id: str, match: Dict[str, Any]) -> None:
+        teams = match.get("teams") or {}
+        text = " ".join(str(v) for v in (
+            match_id, match.get("stage", ""), teams.get("a", ""), teams.get("b", ""),
+            self._team_name(teams.get("a")), self._team_name(teams.get("b")),
+        ))
+        self._add(f"match:{match_id}", text, {
+            "type": "match", "id": match_id, "name": f"{self._team_name(teams.get('a'))} vs {self._team_name(teams.get('b'))}",
+            "time": match.get("time"), "status": match.get("status"),
+        })
+        for player, team_id in self._match_players(match).items():
+            self._ref_player(player, "matches", match_id, True)
+            if team_id:
+                self._ref_player(player, "teams", str(team_id), True)
+
+    def _remove_match(self, match_id: str, match: Dict[str, Any]) -> None:
+        self._remove(f"match:{match_id}")
+        for player in self._match_players(match):
+            self._ref_player(player, "matches", match_id, False)
+
+    def set_teams(self, doc: Dict[str, Any]) -> None:
+        matches = list(self.matches.values())
+        self._reset()
+        teams = doc.get("teams")
+        self.teams = teams if isinstance(teams, dict) else {}
+        for team_id, team in self.teams.items():
+            if not isinstance(team, dict):
+                continue
+            self._add(f"team:{team_id}", f"{team_id} {team.get('name', '')}", {
+                "type": "team", "id": team_id, "name": team.get("name", team_id), "logo": team.get("logo"),
+            })
+            for player in (team.get("members") or []) + (team.get("substitutes") or []):
+                self._ref_player(player, "teams", team_id, True)
+        self.set_matches({"matches": matches})
+
+    def set_matches(self, doc: Dict[str, Any]) -> None:
+        incoming: Dict[str, Dict[str, Any]] = {}
+        for i, match in enumerate(doc.get("matches") or []):
+            if isinstance(match, dict):
+                incoming[str(match.get("id") or f"#{i}")] = match
+        for match_id, match in list(self.matches.items()):
+            if incoming.get(match_id) != match:
+                self._remove_match(match_id, match)
+                del self.matches[match_id]
+        for match_id, match in incoming.items():
+            if match_id not in self.matches:
+                self._add_match(match_id, match)
+                self.matches[match_id] = match
+
+    def _word_matches(self, word: str) -> Dict[str, float]:
+        hits: Dict[str, float] = {}
+        pos = bisect.bisect_left(self._words, word)
+        while pos < len(self._words) and self._words[pos].startswith(word):
+            candidate = self._words[pos]
+            weight = 1.0 if candidate == word else 0.5
+            for doc_id in self._postings.get(f"w:{candidate}", ()):
+                hits[doc_id] = max(hits.get(doc_id, 0.0), weight)
+            pos += 1
+        return hits
+
+    def search(self, query: str, limit: int = 20, kinds: Optional[set] = None) -> List[Dict[str, Any]]:
+        grams, words = _search_terms(query, query=True)
+        if not grams and not words:
+            return []
+        scores: Optional[Dict[str, float]] = None
+        for gram in sorted(grams, key=lambda g: len(self._postings.get(f"g:{g}", ()))):
+            hits = {doc_id: 1.0 for doc_id in self._postings.get(f"g:{gram}", ())}
+            scores = hits if scores is None else {d: s + hits[d] for d, s in scores.items() if d in hits}
+            if not scores:
+                return []
+        for word in words:
+            hits = self._word_matches(word)
+            scores = hits if scores is None else {d: s + hits[d] for d, s in scores.items() if d in hits}
+            if not scores:
+                return []
+
+        needle = unicodedata.normalize("NFKC", query).casefold().strip()
+        results = []
+        for doc_id, score in scores.items():
+            doc = self.docs[doc_id]
+            if kinds and doc["type"] not in kinds:
+                continue
+            name = unicodedata.normalize("NFKC", str(doc.get("name", ""))).casefold()
+            if name == needle or str(doc["id"]).casefold() == needle:
+                score += 3
+            elif name.startswith(needle):
+                score += 1
+            results.append(dict(doc, score=score))
+        order = {"team": 0, "player": 1, "match": 2}
+        results.sort(key=lambda r: (-r["score"], order.get(r["type"], 3), str(r["name"])))
+        return results[:limit]
+
+
+@data_listener
+def _index_search(store: "DataStore", name: str, old: Optional[Dict[str, Any]], new: Dict[str, Any]) -> None:
+    if name not in ("teams.json", "matches.json"):
+        return
+    current = store.derived.get("search")
+    index = current.copy() if current is not None else SearchIndex()
+    if name == "teams.json":
+        index.set_teams(new)
+    else:
+        index.set_matches(new)
+    store.derived["search"] = index
+
+
+def _rate_rows(k: np.ndarray, d: np.ndarray, a: np.ndarray, adr: np.ndarray, rounds: np.ndarray) -> np.ndarray:
+    """HLTV 2.0-style rating for many stat rows at once.
+
+    Uses the public regression 0.0073*KAST + 0.3591*KPR - 0.5329*DPR + 0.2372*Impact
+    + 0.0032*ADR + 0.1587 with Impact = 2.13*KPR + 0.42*APR - 0.41. The data has no
+    KAST, so it is estimated from KPR/DPR/APR (≈72% for an average line); missing
+    ADR (NaN) is estimated as 110*KPR. Rows without rounds come out NaN.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rounds = np.where(rounds > 0, rounds, np.nan)
+        kpr, dpr, apr = k / rounds, d / rounds, a / rounds
+        adr = np.where(np.isnan(adr), 110.0 * kpr, adr)
+        kast = 100.0 * np.clip(0.25 + 0.45 * kpr + 0.45 * (1.0 - dpr) + 0.15 * apr, 0.0, 1.0)
+        impact = 2.13 * kpr + 0.42 * apr - 0.41
+        rating = 0.0073 * kast + 0.3591 * kpr - 0.5329 * dpr + 0.2372 * impact + 0.0032 * adr + 0.1587
+        return np.maximum(rating, 0.0)
+
+
+class RatingIndex:
+    """Per-map player ratings derived from matches.json.
+
+    Ratings entered by hand (non-zero ``rating`` in the data) are kept as-is; the rest
+    are computed by :func:`_rate_rows`. On every update only maps whose score or
+    player_stats changed are recomputed, together, in one vectorized batch. The
+    result is a new ``maps`` table swapped in whole, as request threads read it
+    without a lock.
+    """
+
+    def __init__(self):
+        # (match_id, map_index) -> {"src", "name", "rounds", "rows": [...]}
+        self.maps: Dict[Tuple[str, int], Dict[str, Any]] = {}
+        self._leaderboard: Optional[Tuple[Dict[Tuple[str, int], Dict[str, Any]], List[Dict[str, Any]]]] = None
+
+    def update(self, matches: List[Any]) -> int:
+        wanted: Dict[Tuple[str, int], Dict[str, Any]] = {}
+        for i, match in enumerate(matches):
+            if not isinstance(match, dict):
+                continue
+            match_id = str(match.get("id") or f"#{i}")
+            for j, game_map in enumerate(match.get("maps") or []):
+                if isinstance(game_map, dict):
+                    wanted[(match_id, j)] = game_map
+        maps = {key: entry for key, entry in self.maps.items() if key in wanted}
+
+        stale = []
+        for key, game_map in wanted.items():
+            src = (game_map.get("name"), game_map.get("score"), game_map.get("player_stats"))
+            cached = maps.get(key)
+            if cached is None or cached["src"] != src:
+                stale.append((key, game_map, src))
+        if not stale:
+            if len(maps) != len(self.maps):
+                self.maps = maps
+            return 0
+
+        rows, owners = [], []
+        for n, (key, game_map, src) in enumerate(stale):
+            score = game_map.get("score") or {}
+            rounds = (to_number(score.get("a")) or 0) + (to_number(score.get("b")) or 0)
+            for row in game_map.get("player_stats") or []:
+                if isinstance(row, dict) and row.get("player"):
+                    adr = to_number(row.get("adr"))
+                    rows.append((
+                        to_number(row.get("k")) or 0, to_number(row.get("d")) or 0,
+                        to_number(row.get("a")) or 0, adr if adr else np.nan, rounds,
+                    ))
+                    owners.append((n, row))
+        table = np.array(rows, dtype=float).reshape(-1, 5)
+        ratings = _rate_rows(table[:, 0], table[:, 1], table[:, 2], table[:, 3], table[:, 4])
+
+        computed: Dict[int, List[Dict[str, Any]]] = {n: [] for n in range(len(stale))}
+        for (n, row), value, values in zip(owners, ratings.tolist(), table.tolist()):
+            manual = to_number(row.get("rating"))
+            computed[n].append({
+                "player": row["player"],
+                "team": row.get("team"),
+                "k": int(values[0]),
+                "d": int(values[1]),
+                "rating": round(manual, 2) if manual else (None if value != value else round(value, 2)),
+                "source": "manual" if manual else "computed",
+            })
+        for n, (key, game_map, src) in enumerate(stale):
+            score = game_map.get("score") or {}
+            maps[key] = {
+                "src": src,
+                "name": game_map.get("name"),
+                "rounds": (to_number(score.get("a")) or 0) + (to_number(score.get("b")) or 0),
+                "rows": computed[n],
+            }
+        self.maps = maps
+        return len(stale)
+
+    def for_match(self, match_id: str) -> List[Dict[str, Any]]:
+        out = []
+        for (owner, index), entry in sorted(self.maps.items()):
+            if owner == match_id:
+                out.append({"index": index, "name": entry["name"], "rounds": entry["rounds"], "players": entry["rows"]})
+        return out
+
+    def leaderboard(self) -> List[Dict[str, Any]]:
+        maps = self.maps
+        cached = self._leaderboard
+        if cached is not None and cached[0] is maps:
+            return cached[1]
+        names: Dict[Tuple[str, Any], int] = {}
+        idx, rounds, weighted, kills, deaths = [], [], [], [], []
+        for entry in maps.values():
+            for row in entry["rows"]:
+                if row["rating"] is None or not entry["rounds"]:
+                    continue
+                idx.append(names.setdefault((row["player"], row["team"]), len(names)))
+                rounds.append(entry["rounds"])
+                weighted.append(row["rating"] * entry["rounds"])
+                kills.append(row["k"])
+                deaths.append(row["d"])
+        if not names:
+            self._leaderboard = (maps, [])
+            return []
+        idx_arr = np.array(idx)
+        size = len(names)
+        total_rounds = np.bincount(idx_arr, weights=rounds, minlength=size)
+        rating = np.bincount(idx_arr, weights=weighted, minlength=size) / total_rounds
+        maps_played = np.bincount(idx_arr, minlength=size)
+        k = np.bincount(idx_arr, weights=kills, minlength=size)
+        d = np.bincount(idx_arr, weights=deaths, minlength=size)
+        board = [
+            {
+                "player": player, "team": team, "rating": round(float(rating[i]), 2), "maps": int(maps_played[i]),
+                "rounds": int(total_rounds[i]), "k": int(k[i]), "d": int(d[i]),
+            }
+            for (player, team), i in names.items()
+        ]
+        board.sort(key=lambda r: (-r["rating"], -r["rounds"], r["player"]))
+        self._leaderboard = (maps, board)
+        return board
+
+
+@data_listener
+def _index_ratings(store: "DataStore", name: str, old: Optional[Dict[str, Any]], new: Dict[str, Any]) -> None:
+    if name == "matches.json":
+        matches = new.get("matches")
+        store.derived.setdefault("ratings", RatingIndex()).update(matches if isinstance(matches, list) else [])
+
+
+def _map_facts(match: Dict[str, Any]) -> Counter:
+    """Everything one match adds to the analytics cube, as counts keyed by tuple."""
+    facts: Counter = Counter()
+    teams = match.get("teams") or {}
+    team_a, team_b = teams.get("a"), teams.get("b")
+    opponent = {team_a: team_b, team_b: team_a}
+    start_side: Dict[str, Dict[str, str]] = {}
+    first_ban_seen = set()
+    vetoing = set()
+    for step in match.get("banpick") or []:
+        if not isinstance(step, dict):
+            continue
+        team, action, map_name = step.get("team"), step.get("action"), step.get("map")
+        if not team or not action or not map_name:
+            continue
+        vetoing.add(team)
+        facts[("action", team, map_name, action)] += 1
+        if action == "ban" and team not in first_ban_seen:
+            first_ban_seen.add(team)
+            facts[("first_ban", team, map_name)] += 1
+        side = str(step.get("side") or "").upper()
+        if action == "side" and side in ("CT", "T") and opponent.get(team):
+            start_side[map_name] = {team: side, opponent[team]: "T" if side == "CT" else "CT"}
+    for team in vetoing:
+        facts[("vetoes", team)] += 1
+
+    if match.get("status") != "completed" or not team_a or not team_b:
+        return facts
+    for game_map in match.get("maps") or []:
+        if not isinstance(game_map, dict) or not game_map.get("name"):
+            continue
+        score = game_map.get("score") or {}
+        score_a, score_b = to_number(score.get("a")), to_number(score.get("b"))
+        if score_a is None or score_b is None or score_a == score_b:
+            continue
+        map_name = game_map["name"]
+        winner = team_a if score_a > score_b else team_b
+        sides = start_side.get(map_name, {})
+        for team in (team_a, team_b):
+            facts[("played", team, map_name)] += 1
+            facts[("won", team, map_name)] += team == winner
+            if team in sides:
+                facts[("side_played", team, map_name, sides[team])] += 1
+                facts[("side_won", team, map_name, sides[team])] += team == winner
+    return facts
+
+
+class MapAnalytics:
+    """Team x map veto and result counts for ``/api/analytics/maps``.
+
+    Every match's contribution is kept, so a write only subtracts and re-adds the
+    matches whose teams, veto or maps changed. Writes build a new cube and swap it
+    in, so ``view`` on a request thread never sees one half-updated. The JSON view
+    is rebuilt lazily, once per cube.
+    """
+
+    def __init__(self):
+        self.cube: Counter = Counter()
+        self._facts: Dict[str, Tuple[Any, Counter]] = {}
+        self._view: Optional[Tuple[Counter, Dict[str, Any]]] = None
+
+    def update(self, matches: List[Any]) -> int:
+        seen = set()
+        changed = 0
+        cube = self.cube.copy()
+        for i, match in enumerate(matches):
+            if not isinstance(match, dict):
+                continue
+            match_id = str(match.get("id") or f"#{i}")
+            seen.add(match_id)
+            src = (match.get("status"), match.get("teams"), match.get("banpick"), match.get("maps"))
+            cached = self._facts.get(match_id)
+            if cached is not None and cached[0] == src:
+                continue
+            if cached is not None:
+                cube.subtract(cached[1])
+            facts = _map_facts(match)
+            cube.update(facts)
+            self._facts[match_id] = (src, facts)
+            changed += 1
+        for match_id in self._facts.keys() - seen:
+            cube.subtract(self._facts.pop(match_id)[1])
+            changed += 1
+        if changed:
+            self.cube = +cube
+        return changed
+
+    def view(self) -> Dict[str, Any]:
+        cube = self.cube
+        cached = self._view
+        if cached is not None and cached[0] is cube:
+            return cached[1]
+        maps: Dict[str, Dict[str, Any]] = {}
+        teams: Dict[str, Dict[str, Any]] = {}
+
+        def map_row(table: Dict[str, Dict[str, Any]], map_name: str) -> Dict[str, Any]:
+            return table.setdefault(map_name, {
+                "ban": 0, "pick": 0, "side": 0, "first_ban": 0, "played": 0, "won": 0,
+                "sides": {"CT": {"played": 0, "won": 0}, "T": {"played": 0, "won": 0}},
+            })
+
+        def team_row(team: str) -> Dict[str, Any]:
+            return teams.setdefault(team, {"vetoes": 0, "first_bans": 0, "maps": {}})
+
+        for key, count in cube.items():
+            kind, team = key[0], key[1]
+            if kind == "vetoes":
+                team_row(team)["vetoes"] = count
+                continue
+            map_name = key[2]
+            rows = (map_row(team_row(team)["maps"], map_name), map_row(maps, map_name))
+            for row in rows:
+                if kind == "action":
+                    row[key[3]] = row.get(key[3], 0) + count
+                elif kind in ("first_ban", "played", "won"):
+                    row[kind] += count
+                else:
+                    row["sides"][key[3]]["played" if kind == "side_played" else "won"] += count
+            if kind == "first_ban":
+                team_row(team)["first_bans"] += count
+
+        def finish(row: Dict[str, Any]) -> None:
+            row["win_rate"] = round(row["won"] / row["played"], 4) if row["played"] else None
+            for side in row["sides"].values():
+                side["win_rate"] = round(side["won"] / side["played"], 4) if side["played"] else None
+
+        for row in maps.values():
+            # Both teams count each decided map; halve to count maps. Exactly one of them won it.
+            row["played"] //= 2
+            del row["won"]
+            for side in row["sides"].values():
+                side["win_rate"] = round(side["won"] / side["played"], 4) if side["played"] else None
+        for team in teams.values():
+            for row in team["maps"].values():
+                finish(row)
+        view = {"maps": maps, "teams": teams}
+        self._view = (cube, view)
+        return view
+
+
+@data_listener
+def _index_analytics(store: "DataStore", name: str, old: Optional[Dict[str, Any]], new: Dict[str, Any]) -> None:
+    if name == "matches.json":
+        matches = new.get("matches")
+        store.derived.setdefault("analytics", MapAnalytics()).update(matches if isinstance(matches, list) else [])
@@ -0,0 +1,104 @@
+"""Counters, histograms and gauges shared by the server modules and served at ``/metrics``."""
+
+import bisect
+import functools
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class Metrics:
+    """Process-local counters and histograms rendered in Prometheus text format."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._help: Dict[str, Tuple[str, str]] = {}
+        self._counters: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float] = {}
+        self._histograms: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], List[float]] = {}
+        self._gauges: Dict[str, Tuple[str, Optional[str], Callable[[], Any]]] = {}
+
+    def describe(self, name: str, kind: str, text: str) -> None:
+        self._help[name] = (kind, text)
+
+    def inc(self, name: str, value: float = 1.0, **labels: str) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + value
+
+    def observe(self, name: str, seconds: float, **labels: str) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        index = bisect.bisect_left(LATENCY_BUCKETS, seconds)
+        with self._lock:
+            hist = self._histograms.get(key)
+            if hist is None:
+                # One slot per bucket, then +Inf, sum, count.
+                hist = self._histograms[key] = [0.0] * (len(LATENCY_BUCKETS) + 3)
+            hist[index] += 1
+            hist[-2] += seconds
+            hist[-1] += 1
+
+    def gauge(self, name: str, text: str, fn: Callable[[], Any], label: Optional[str] = None) -> None:
+        """Register a value read at render time; with ``label``, ``fn`` returns ``{label value: value}``."""
+        self._gauges[name] = (text, label, fn)
+
+    def render(self) -> str:
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {key: list(value) for key, value in self._histograms.items()}
+        lines: List[str] = []
+        seen = set()
+
+        def header(name: str) -> None:
+            if name not in seen and name in self._help:
+                kind, text = self._help[name]
+                lines.append(f"# HELP {name} {text}")
+                lines.append(f"# TYPE {name} {kind}")
+            seen.add(name)
+
+        def fmt(labels: Tuple[Tuple[str, str], ...]) -> str:
+            if not labels:
+                return ""
+            escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"') for _, v in labels)
+            return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(labels, escaped)) + "}"
+
+        for (name, labels), value in sorted(counters.items()):
+            header(name)
+            lines.append(f"{name}{fmt(labels)} {value:g}")
+        for (name, labels), hist in sorted(histograms.items()):
+            header(name)
+            cumulative = 0.0
+            for bound, count in zip(LATENCY_BUCKETS + (float("inf"),), hist):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                lines.append(f"{name}_bucket{fmt(labels + (('le', le),))} {cumulative:g}")
+            lines.append(f"{name}_sum{fmt(labels)} {hist[-2]:.6f}")
+            lines.append(f"{name}_count{fmt(labels)} {hist[-1]:g}")
+        for name, (text, label, fn) in sorted(self._gauges.items()):
+            lines.append(f"# HELP {name} {text}")
+            lines.append(f"# TYPE {name} gauge")
+            if label is None:
+                lines.append(f"{name} {fn():g}")
+                continue
+            for key, value in sorted(fn().items()):
+                lines.append(f"{name}{fmt(((label, key),))} {value:g}")
+        return "\n".join(lines) + "\n"
+
+
+METRICS = Metrics()
+METRICS.describe("bhml_io_seconds", "histogram", "Time spent in disk I/O helpers.")
+METRICS.describe("bhml_cache_requests_total", "counter", "Cache lookups by cache and result.")
+
+
+def timed(op: str):
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                METRICS.observe("bhml_io_seconds", time.perf_counter() - started, op=op)
+        return wrapper
+    return decorator
@@ -0,0 +1,684 @@
+"""Data files on disk: the change journal, content-addressed history and the single writer.
+
+A :class:`DataStore` owns one ``data/`` directory. Every write goes through
+:data:`WRITER`, which commits bursts of updates as one journal entry.
+"""
+
+import bisect
+import functools
+import gzip
+import hashlib
+import json
+import logging
+import os
+import queue
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: in-process serialization only
+    fcntl = None
+
+from .metrics import METRICS, timed
+
+DATA_FILES = ("teams.json", "matches.json")
+JOURNAL_NAME = "journal.jsonl"
+LOCK_NAME = ".write.lock"
+# How long the writer waits for more updates before committing a batch.
+GROUP_COMMIT_WINDOW = float(os.environ.get("BHML_GROUP_COMMIT_MS", "5")) / 1000
+HISTORY_DIR_NAME = ".history"
+HISTORY_KEEP = int(os.environ.get("BHML_HISTORY_KEEP", "200"))
+# Pruned versions to accumulate before sweeping unreferenced objects (a sweep reads every manifest).
+HISTORY_GC_EVERY = int(os.environ.get("BHML_HISTORY_GC_EVERY", "50"))
+# Per-file collection split into separately addressed objects so unchanged entries dedup across versions.
+HISTORY_COLLECTIONS = {"matches.json": "matches", "teams.json": "teams"}
+
+logger = logging.getLogger(__name__)
+
+METRICS.describe("bhml_commit_seconds", "histogram", "Writer group-commit latency.")
+METRICS.describe("bhml_commit_writes_total", "counter", "Writes handed to the writer, coalesced or not.")
+
+
+@timed("read_json")
+def read_json(path: Path) -> Dict[str, Any]:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def write_text(path: Path, content: Any) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Unique temp name per writer so concurrent replaces never clobber each other's temp file.
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(content.encode("utf-8") if isinstance(content, str) else content)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+@timed("write_json")
+def write_json(path: Path, payload: Dict[str, Any]) -> None:
+    write_text(path, json.dumps(payload, ensure_ascii=False, indent=2))
+
+
+class History:
+    """Content-addressed, gzip-compressed snapshots of the data files.
+
+    Layout under ``data/.history``: ``objects/<sha256>.gz`` holds one JSON value,
+    ``versions/<file>/<n>.json`` lists the objects making up version ``n`` and
+    ``refs/<file>`` names the version currently live.
+    """
+
+    def __init__(self, root: Path, keep: int = HISTORY_KEEP, gc_every: int = HISTORY_GC_EVERY):
+        self.root = root
+        self.keep = keep
+        self.gc_every = gc_every
+        self._pruned = 0
+        self._lock = threading.RLock()
+
+    def _put(self, value: Any) -> str:
+        raw = json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        digest = hashlib.sha256(raw).hexdigest()
+        path = self.root / "objects" / f"{digest}.gz"
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_bytes(gzip.compress(raw))
+            tmp_path.replace(path)
+        return digest
+
+    def _get(self, digest: str) -> Any:
+        return json.loads(gzip.decompress((self.root / "objects" / f"{digest}.gz").read_bytes()))
+
+    def _versions_dir(self, name: str) -> Path:
+        return self.root / "versions" / name
+
+    def _version_numbers(self, name: str) -> List[int]:
+        directory = self._versions_dir(name)
+        if not directory.exists():
+            return []
+        return sorted(int(p.stem) for p in directory.glob("*.json") if p.stem.isdigit())
+
+    def current(self, name: str) -> Optional[int]:
+        ref = self.root / "refs" / name
+        try:
+            return int(ref.read_text(encoding="utf-8").strip())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _set_ref(self, name: str, version: int) -> None:
+        ref = self.root / "refs" / name
+        ref.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = ref.with_suffix(".tmp")
+        tmp_path.write_text(str(version), encoding="utf-8")
+        tmp_path.replace(ref)
+
+    def _manifest(self, name: str, version: int) -> Dict[str, Any]:
+        return json.loads((self._versions_dir(name) / f"{version}.json").read_text(encoding="utf-8"))
+
+    def record(self, name: str, payload: Dict[str, Any], seq: int) -> int:
+        with self._lock:
+            key = HISTORY_COLLECTIONS.get(name)
+            collection = payload.get(key) if key else None
+            shell = {k: v for k, v in payload.items() if k != key} if collection is not None else payload
+            manifest: Dict[str, Any] = {"ts": time.time(), "seq": seq, "shell": self._put(shell)}
+            if isinstance(collection, list):
+                manifest["key"] = key
+                manifest["items"] = [self._put(item) for item in collection]
+            elif isinstance(collection, dict):
+                manifest["key"] = key
+                manifest["items"] = {k: self._put(v) for k, v in collection.items()}
+
+            numbers = self._version_numbers(name)
+            current = self.current(name)
+            if current is not None and current in numbers:
+                previous = self._manifest(name, current)
+                if all(previous.get(k) == manifest.get(k) for k in ("shell", "key", "items")):
+                    return current
+            version = (numbers[-1] if numbers else 0) + 1
+            manifest["version"] = version
+            path = self._versions_dir(name) / f"{version}.json"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(manifest), encoding="utf-8")
+            self._set_ref(name, version)
+            if len(numbers) + 1 > self.keep:
+                self._prune(name, numbers[: len(numbers) + 1 - self.keep])
+            return version
+
+    def load(self, name: str, version: int) -> Dict[str, Any]:
+        manifest = self._manifest(name, version)
+        payload = self._get(manifest["shell"])
+        items = manifest.get("items")
+        if isinstance(items, list):
+            payload[manifest["key"]] = [self._get(d) for d in items]
+        elif isinstance(items, dict):
+            payload[manifest["key"]] = {k: self._get(d) for k, d in items.items()}
+        return payload
+
+    def list(self, name: str) -> List[Dict[str, Any]]:
+        out = []
+        for version in reversed(self._version_numbers(name)):
+            manifest = self._manifest(name, version)
+            items = manifest.get("items")
+            out.append({
+                "version": version,
+                "ts": manifest.get("ts"),
+                "seq": manifest.get("seq"),
+                "items": len(items) if items is not None else None,
+            })
+        return out
+
+    def rollback(self, name: str, version: int) -> Dict[str, Any]:
+        with self._lock:
+            payload = self.load(name, version)
+            self._set_ref(name, version)
+            return payload
+
+    def _prune(self, name: str, versions: List[int]) -> None:
+        current = self.current(name)
+        for version in versions:
+            if version != current:
+                (self._versions_dir(name) / f"{version}.json").unlink(missing_ok=True)
+        self._pruned += len(versions)
+        if self._pruned >= self.gc_every:
+            self.gc()
+
+    def gc(self) -> int:
+        with self._lock:
+            live = set()
+            for directory in (self.root / "versions").glob("*"):
+                for path in directory.glob("*.json"):
+                    manifest = json.loads(path.read_text(encoding="utf-8"))
+                    live.add(manifest["shell"])
+                    items = manifest.get("items") or []
+                    live.update(items.values() if isinstance(items, dict) else items)
+            removed = 0
+            for path in (self.root / "objects").glob("*.gz"):
+                if path.name[:-3] not in live:
+                    path.unlink(missing_ok=True)
+                    removed += 1
+            self._pruned = 0
+            return removed
+
+
+# Called as fn(store, name, old, new) whenever a data file's cached content changes;
+# ``old`` is None the first time a file is loaded. Derived indexes live in ``store.derived``.
+DATA_LISTENERS: List[Callable[["DataStore", str, Optional[Dict[str, Any]], Dict[str, Any]], None]] = []
+
+
+def data_listener(fn: Callable[["DataStore", str, Optional[Dict[str, Any]], Dict[str, Any]], None]):
+    DATA_LISTENERS.append(fn)
+    return fn
+
+
+class ChangeLog:
+    """Latest change sequence per match/team/top-level field, for ``/api/changes``.
+
+    Only changes observed by this process are known; asking for anything older than
+    ``floor`` gets a full-reload answer instead. The floor follows the journal as it
+    is trimmed, so the log only remembers what a client can still ask about.
+    """
+
+    def __init__(self, floor: int):
+        self.floor = floor
+        # (file, kind, key) -> (created_seq, changed_seq, deleted, gaps): ``gaps`` are the
+        # [deleted_seq, re-added_seq) windows in which a re-added item did not exist.
+        self._entries: Dict[Tuple[str, str, str], Tuple[int, int, bool, Tuple[Tuple[int, int], ...]]] = {}
+
+    @staticmethod
+    def _split(name: str, payload: Dict[str, Any]) -> Dict[Tuple[str, str], Any]:
+        key = HISTORY_COLLECTIONS.get(name)
+        items: Dict[Tuple[str, str], Any] = {}
+        for field, value in payload.items():
+            if field == key and isinstance(value, list):
+                for i, item in enumerate(value):
+                    item_id = item.get("id") if isinstance(item, dict) else None
+                    items[(key, str(item_id) if item_id else f"#{i}")] = item
+            elif field == key and isinstance(value, dict):
+                for item_id, item in value.items():
+                    items[(key, item_id)] = item
+            else:
+                items[("meta", field)] = value
+        return items
+
+    def record(self, name: str, old: Optional[Dict[str, Any]], new: Dict[str, Any], seq: int) -> None:
+        if old is None:
+            # First sight of this file: nothing to diff against.
+            self.floor = max(self.floor, seq)
+            return
+        before, after = self._split(name, old), self._split(name, new)
+        for item_key, value in after.items():
+            if item_key in before and before[item_key] == value:
+                continue
+            created, changed, deleted, gaps = self._entries.get((name, *item_key), (0, 0, False, ()))
+            if item_key not in before:
+                if deleted:
+                    gaps += ((changed, seq),)
+                else:
+                    created, gaps = seq, ()
+            self._entries[(name, *item_key)] = (created, seq, False, gaps)
+        for item_key in before.keys() - after.keys():
+            created, _, _, gaps = self._entries.get((name, *item_key), (0, 0, False, ()))
+            self._entries[(name, *item_key)] = (created, seq, True, gaps)
+
+    def trim(self, floor: int) -> None:
+        """Forget changes at or before ``floor``; older ``since`` values get a full reload."""
+        if floor <= self.floor:
+            return
+        self.floor = floor
+        self._entries = {
+            key: (created, changed, deleted, tuple(gap for gap in gaps if gap[1] > floor))
+            for key, (created, changed, deleted, gaps) in self._entries.items()
+            if changed > floor
+        }
+
+    def since(self, since: int, docs: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        current = {name: self._split(name, doc) for name, doc in docs.items()}
+        out: Dict[str, Any] = {}
+        for (name, kind, key), (created, changed, deleted, gaps) in list(self._entries.items()):
+            if changed <= since:
+                continue
+            if kind == "meta":
+                out.setdefault("meta", {})[key] = None if deleted else current[name].get((kind, key))
+                continue
+            keyed = isinstance(docs[name].get(kind), dict)
+            bucket = out.setdefault(kind, {"added": {} if keyed else [], "modified": {} if keyed else [], "deleted": []})
+            # Whether a client synced at ``since`` already holds the item.
+            held = created <= since and not any(start <= since < end for start, end in gaps)
+            if deleted:
+                if held:
+                    bucket["deleted"].append(key)
+            elif (kind, key) in current[name]:
+                target = bucket["modified" if held else "added"]
+                if keyed:
+                    target[key] = current[name][(kind, key)]
+                else:
+                    target.append(current[name][(kind, key)])
+        return out
+
+
+class DataStore:
+    """Cached view of one data directory plus its append-only change journal.
+
+    Every write to a data file is recorded as one JSON line ``{"seq", "ts", "files"}``
+    in ``journal.jsonl``; replicas replay these entries in ``seq`` order.
+    """
+
+    def __init__(self, data_dir: Path):
+        self.data_dir = data_dir
+        self.journal_path = data_dir / JOURNAL_NAME
+        self.read_only = False
+        self.seq = 0
+        self.first_seq: Optional[int] = None
+        self._lock = threading.RLock()
+        self._cache: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+        self._offsets: List[Tuple[int, int]] = []
+        self._journal_end = 0
+        self._journal_ino: Optional[int] = None
+        # Files written by other processes sharing this directory, seen via their journal entries.
+        self._foreign: set = set()
+        self.history = History(data_dir / HISTORY_DIR_NAME)
+        self._sync_journal()
+        self.changes = ChangeLog(self.seq)
+        self.derived: Dict[str, Any] = {}
+
+    def _sync_journal(self, repair: bool = False) -> None:
+        # With ``repair`` (only under the file lock, so no writer is mid-line) a torn tail
+        # left by a crash is cut off; otherwise the next append would be glued onto it.
+        try:
+            st = self.journal_path.stat()
+        except FileNotFoundError:
+            return
+        size = st.st_size
+        if size < self._journal_end or st.st_ino != self._journal_ino:
+            # Truncated or compacted (replaced) by another process: index it again from the start.
+            self._offsets, self._journal_end, self.first_seq = [], 0, None
+            self._journal_ino = st.st_ino
+        if size == self._journal_end:
+            return
+        offset = self._journal_end
+        with self.journal_path.open("rb") as fh:
+            fh.seek(offset)
+            for line in fh:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    entry = json.loads(line)
+                    seq = int(entry["seq"])
+                except (ValueError, KeyError, TypeError):
+                    # Torn write; later appends continue after it.
+                    offset += len(line)
+                    continue
+                self._offsets.append((seq, offset))
+                self._foreign.update(entry.get("files", {}))
+                offset += len(line)
+        if repair and offset < size:
+            logger.warning("journal: dropping %d torn byte(s) at offset %d", size - offset, offset)
+            os.truncate(self.journal_path, offset)
+        self._journal_end = offset
+        if self._offsets:
+            self.first_seq = self._offsets[0][0]
+            self.seq = self._offsets[-1][0]
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        with self._lock:
+            lock_fh = None
+            if fcntl is not None:
+                self.data_dir.mkdir(parents=True, exist_ok=True)
+                lock_fh = (self.data_dir / LOCK_NAME).open("a")
+                fcntl.flock(lock_fh, fcntl.LOCK_EX)
+            try:
+                self._sync_journal(repair=True)
+                yield
+            finally:
+                if lock_fh is not None:
+                    fcntl.flock(lock_fh, fcntl.LOCK_UN)
+                    lock_fh.close()
+
+    def _stamp(self, name: str) -> Optional[Tuple[int, int]]:
+        try:
+            st = (self.data_dir / name).stat()
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def read(self, name: str) -> Dict[str, Any]:
+        with self._lock:
+            stamp = self._stamp(name)
+            if stamp is None:
+                return {}
+            cached = self._cache.get(name)
+            if cached and cached[0] == stamp:
+                METRICS.inc("bhml_cache_requests_total", cache="data", result="hit")
+                return cached[1]
+            METRICS.inc("bhml_cache_requests_total", cache="data", result="miss")
+            payload = read_json(self.data_dir / name)
+            seq = self.seq
+            if not self.read_only:
+                with self._locked():
+                    if cached and name not in self._foreign:
+                        # Edited behind our back (editor.py over SFTP, manual copy): journal it too.
+                        self._record_base(name, cached[1])
+                        self.history.record(name, payload, self._append({name: payload}))
+                    elif name not in self._foreign:
+                        self._record_base(name, payload)
+                    self._foreign.discard(name)
+                    seq = self.seq
+            self._set(name, payload, seq, stamp)
+            return payload
+
+    def _record_base(self, name: str, payload: Optional[Dict[str, Any]] = None) -> None:
+        # A file's first recorded change must be undoable: snapshot the content it replaces.
+        if self.history.current(name) is not None or self._stamp(name) is None:
+            return
+        if payload is None:
+            cached = self._cache.get(name)
+            payload = cached[1] if cached and cached[0] == self._stamp(name) else read_json(self.data_dir / name)
+        self.history.record(name, payload, self.seq)
+
+    def resident_bytes(self) -> int:
+        return sum(stamp[1] for stamp, _ in self._cache.values() if stamp)
+
+    def unload(self) -> None:
+        """Drop parsed files and derived indexes; the next read parses and re-indexes them."""
+        with self._lock:
+            self._cache.clear()
+            self.derived = {}
+
+    def _set(self, name: str, payload: Dict[str, Any], seq: int, stamp: Optional[Tuple[int, int]] = None) -> None:
+        cached = self._cache.get(name)
+        self._cache[name] = (stamp or self._stamp(name), payload)
+        old = cached[1] if cached else None
+        self.changes.record(name, old, payload, seq)
+        for listener in DATA_LISTENERS:
+            try:
+                listener(self, name, old, payload)
+            except Exception:
+                logger.exception("data listener %s failed for %s", listener.__name__, name)
+
+    def write(self, name: str, payload: Dict[str, Any]) -> int:
+        return WRITER.submit(self, name, payload)
+
+    def commit(self, files: Dict[str, Dict[str, Any]]) -> int:
+        with self._locked():
+            for name in files:
+                self._record_base(name)
+            for name, payload in files.items():
+                write_json(self.data_dir / name, payload)
+                self._foreign.discard(name)
+            seq = self._append(files)
+            for name, payload in files.items():
+                self._set(name, payload, seq)
+                self.history.record(name, payload, seq)
+            return seq
+
+    def rollback(self, name: str, version: int) -> int:
+        with self._locked():
+            payload = self.history.rollback(name, version)
+            write_json(self.data_dir / name, payload)
+            self._foreign.discard(name)
+            seq = self._append({name: payload})
+            self._set(name, payload, seq)
+            return seq
+
+    def _append(self, files: Dict[str, Any], seq: Optional[int] = None, full: bool = False) -> int:
+        seq = self.seq + 1 if seq is None else seq
+        entry: Dict[str, Any] = {"seq": seq, "ts": time.time(), "files": files}
+        if full:
+            entry["full"] = True
+        line = (json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8")
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        with self.journal_path.open("ab") as fh:
+            offset = fh.tell()
+            fh.write(line)
+            fh.flush()
+            os.fsync(fh.fileno())
+            self._journal_ino = os.fstat(fh.fileno()).st_ino
+        self._offsets.append((seq, offset))
+        self._journal_end = offset + len(line)
+        if self.first_seq is None:
+            self.first_seq = seq
+        self.seq = seq
+        if len(self._offsets) > 2 * self.history.keep:
+            self._compact()
+        return seq
+
+    def _compact(self) -> None:
+        # Keep as many entries as history keeps versions; replicas behind the cut get a full entry.
+        kept = self._offsets[-self.history.keep:]
+        start = kept[0][1]
+        with self.journal_path.open("rb") as fh:
+            fh.seek(start)
+            tail = fh.read(self._journal_end - start)
+        write_text(self.journal_path, tail)
+        self._journal_ino = self.journal_path.stat().st_ino
+        self._offsets = [(seq, offset - start) for seq, offset in kept]
+        self._journal_end = len(tail)
+        self.first_seq = self._offsets[0][0]
+        self.changes.trim(self.first_seq - 1)
+
+    def full_entry(self) -> Dict[str, Any]:
+        with self._lock:
+            files = {name: self.read(name) for name in DATA_FILES if self._stamp(name)}
+            return {"seq": self.seq, "ts": time.time(), "files": files, "full": True}
+
+    def entries_since(self, since: int, limit: int = 100) -> List[Dict[str, Any]]:
+        with self._lock:
+            for name in DATA_FILES:
+                self.read(name)
+            first = self.first_seq if self.first_seq is not None else self.seq + 1
+            if since > self.seq or since < first - 1:
+                # Caller is behind what the journal still holds (or ahead of it): resync from a full copy.
+                return [self.full_entry()]
+            start = bisect.bisect_right(self._offsets, (since, float("inf")))
+            window = self._offsets[start:start + limit]
+        if not window:
+            return []
+        entries = []
+        with self.journal_path.open("rb") as fh:
+            fh.seek(window[0][1])
+            for _ in window:
+                line = fh.readline()
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    break
+        return entries
+
+    def apply(self, entry: Dict[str, Any]) -> None:
+        with self._locked():
+            for name, payload in entry.get("files", {}).items():
+                if name not in DATA_FILES:
+                    continue
+                write_json(self.data_dir / name, payload)
+                self._set(name, payload, int(entry["seq"]))
+                self.history.record(name, payload, int(entry["seq"]))
+            self._append(entry.get("files", {}), seq=int(entry["seq"]), full=bool(entry.get("full")))
+
+
+class _PendingWrite:
+    def __init__(
+        self, store: Optional[DataStore], path: Path, payload: Any, action: Optional[Callable[[], int]] = None
+    ):
+        self.store = store
+        self.path = path
+        self.payload = payload
+        # Run as-is on the writer thread instead of being coalesced (rollbacks).
+        self.action = action
+        self.done = threading.Event()
+        self.finished = False
+        self.seq: Optional[int] = None
+        self.error: Optional[BaseException] = None
+
+
+class CommitQueue:
+    """Single writer thread: serializes all disk writes and commits bursts as one group.
+
+    Updates to the same file queued within ``GROUP_COMMIT_WINDOW`` collapse into the
+    last one and all files of a store land in a single journal entry.
+    """
+
+    def __init__(self, window: float = GROUP_COMMIT_WINDOW):
+        self.window = window
+        self.stats = {"commits": 0, "writes": 0, "coalesced": 0, "last_ms": 0.0, "max_ms": 0.0, "total_ms": 0.0}
+        self._reset()
+        if hasattr(os, "register_at_fork"):
+            # A forked child inherits the queue's waiter list but not the writer thread.
+            os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self) -> None:
+        self._queue: "queue.Queue[_PendingWrite]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_started(self) -> None:
+        # Started lazily so forking servers (gunicorn --preload) get a writer per worker.
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="bhml-writer", daemon=True)
+                self._thread.start()
+
+    def _submit(self, item: _PendingWrite) -> _PendingWrite:
+        self._ensure_started()
+        self._queue.put(item)
+        item.done.wait()
+        if item.error is not None:
+            raise item.error
+        return item
+
+    def submit(self, store: DataStore, name: str, payload: Dict[str, Any]) -> int:
+        return self._submit(_PendingWrite(store, store.data_dir / name, payload)).seq
+
+    def submit_file(self, path: Path, content: Any) -> None:
+        self._submit(_PendingWrite(None, path, content))
+
+    def submit_rollback(self, store: DataStore, name: str, version: int) -> int:
+        action = functools.partial(store.rollback, name, version)
+        return self._submit(_PendingWrite(store, store.data_dir / name, None, action=action)).seq
+
+    def _drain(self, first: _PendingWrite) -> List[_PendingWrite]:
+        batch = [first]
+        deadline = time.monotonic() + self.window
+        while True:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                return batch
+
+    def _commit(self, items: List[_PendingWrite]) -> Tuple[int, int]:
+        groups: Dict[Optional[DataStore], Dict[Path, _PendingWrite]] = {}
+        for item in items:
+            groups.setdefault(item.store, {})[item.path] = item
+        for store, latest in groups.items():
+            try:
+                if store is None:
+                    for path, item in latest.items():
+                        write_text(path, item.payload)
+                    seq = None
+                else:
+                    seq = store.commit({path.name: item.payload for path, item in latest.items()})
+                error = None
+            except Exception as e:
+                seq, error = None, e
+            for item in items:
+                if item.store is store:
+                    item.seq, item.error, item.finished = seq, error, True
+        return len(groups), sum(len(v) for v in groups.values())
+
+    def _process(self, batch: List[_PendingWrite]) -> None:
+        started = time.perf_counter()
+        groups = distinct = 0
+        pending: List[_PendingWrite] = []
+        # Actions split the batch so everything queued before one is committed before it runs.
+        for item in batch + [None]:
+            if item is not None and item.action is None:
+                pending.append(item)
+                continue
+            if pending:
+                committed = self._commit(pending)
+                groups, distinct, pending = groups + committed[0], distinct + committed[1], []
+            if item is not None:
+                try:
+                    item.seq = item.action()
+                except Exception as e:
+                    item.error = e
+                item.finished = True
+                groups, distinct = groups + 1, distinct + 1
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.stats["commits"] += 1
+        self.stats["writes"] += len(batch)
+        self.stats["coalesced"] += len(batch) - distinct
+        METRICS.observe("bhml_commit_seconds", elapsed_ms / 1000)
+        METRICS.inc("bhml_commit_writes_total", len(batch))
+        self.stats["last_ms"] = elapsed_ms
+        self.stats["max_ms"] = max(self.stats["max_ms"], elapsed_ms)
+        self.stats["total_ms"] += elapsed_ms
+        logger.info("commit: %d write(s) in %d group(s), %.1f ms", len(batch), groups, elapsed_ms)
+
+    def _run(self) -> None:
+        while True:
+            batch = self._drain(self._queue.get())
+            try:
+                self._process(batch)
+            except Exception as e:
+                # Never leave a caller waiting on a batch the writer gave up on.
+                logger.exception("writer: batch of %d write(s) failed", len(batch))
+                for item in batch:
+                    if not item.finished:
+                        item.error = e
+            finally:
+                for item in batch:
+                    item.done.set()
+
+
+WRITER = CommitQueue()
@@ -99,7 +99,7 @@ const render = (container, match, teams) => {
       stats.forEach(ps => {
         const key = `${ps.player}-${ps.team}`;
         if (!playerMap.has(key)) {
-          playerMap.set(key, { ...ps });
+          playerMap.set(key, { ...ps, _count: ps.rating ? 1 : 0 });
         } else {
           const entry = playerMap.get(key);
           entry.k = (toNumber(entry.k) || 0) + (toNumber(ps.k) || 0);
@@ -335,6 +335,67 @@ const render = (container, match, teams) => {
   });
 };
 
+const CHANGES_POLL_MS = 30000;
+
+// Returns null when the site is served without server.py (plain static hosting).
+const fetchDataVersion = async () => {
+  try {
+    const res = await fetch("api/changes?since=-1");
+    if (!res.ok) return null;
+    const data = await res.json();
+    return Number.isInteger(data?.version) ? data.version : null;
+  } catch (error) {
+    return null;
+  }
+};
+
+const pollChanges = async (matchId, version) => {
+  let nextVersion = version;
+  try {
+    const res = await fetch(`api/changes?since=${version}`);
+    if (res.ok) {
+      const data = await res.json();
+      const changes = data?.changes || {};
+      const touched = [...(changes.matches?.added || []), ...(changes.matches?.modified || [])].some(
+        (match) => match?.id === matchId
+      );
+      if (data?.full_reload || touched || changes.teams) {
+        await loadMatch();
+      }
+      if (Number.isInteger(data?.version)) {
+        nextVersion = data.version;
+      }
+    }
+  } catch (error) {
+    console.warn("增量同步失败", error);
+  }
+  setTimeout(() => pollChanges(matchId, nextVersion), CHANGES_POLL_MS);
+};
+
+// Fills in ratings that are missing from the data with the server's computed ones.
+// Without server.py the fetch fails and the K/D fallback in render() is used instead.
+const applyServerRatings = async (match) => {
+  if (!match?.id || !Array.isArray(match.maps)) return;
+  try {
+    const res = await fetch(`api/ratings?match=${encodeURIComponent(match.id)}`);
+    if (!res.ok) return;
+    const data = await res.json();
+    (data?.maps || []).forEach((entry) => {
+      const stats = match.maps[entry.index]?.player_stats;
+      if (!Array.isArray(stats)) return;
+      const byPlayer = new Map((entry.players || []).map((row) => [`${row.player}-${row.team}`, row]));
+      stats.forEach((ps) => {
+        const rated = byPlayer.get(`${ps.player}-${ps.team}`);
+        if (!toNumber(ps.rating) && rated && rated.rating !== null) {
+          ps.rating = rated.rating;
+        }
+      });
+    });
+  } catch (error) {
+    // Static hosting: keep the data as-is.
+  }
+};
+
 const loadMatch = async () => {
   const container = document.querySelector("#match-detail");
   if (!container) {
@@ -357,6 +418,7 @@ const loadMatch = async () => {
     const match =
       Array.isArray(matchesData?.matches) &&
       matchesData.matches.find((item) => item?.id === matchId);
+    await applyServerRatings(match);
     render(container, match, teamsData?.teams);
   } catch (error) {
     console.error("加载失败", error);
@@ -364,4 +426,14 @@ const loadMatch = async () => {
   }
 };
 
-loadMatch();
+const initMatch = async () => {
+  // Take the version before the data so no change can slip in between.
+  const version = await fetchDataVersion();
+  await loadMatch();
+  const matchId = new URLSearchParams(window.location.search).get("id");
+  if (version !== null && matchId) {
+    setTimeout(() => pollChanges(matchId, version), CHANGES_POLL_MS);
+  }
+};
+
+initMatch();
@@ -1,28 +1,602 @@
+import base64
+import concurrent.futures
+import csv
+import functools
+import io
 import json
+import mimetypes
+import multiprocessing
 import os
+import re
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter, OrderedDict, deque
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
-from flask import Flask, jsonify, request, send_from_directory
+try:
+    import msgpack
+except ImportError:  # optional: format=msgpack answers 406 without it
+    msgpack = None
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:  # optional: the stats export falls back to CSV only
+    pyarrow = None
+
+import numpy as np
+from flask import Flask, Response, g, has_request_context, jsonify, redirect, request, send_from_directory
+from werkzeug.exceptions import NotFound
+from werkzeug.http import http_date
+from werkzeug.security import safe_join
+from werkzeug.wsgi import wrap_file
+
+from league.indexes import MapAnalytics, RatingIndex, SearchIndex, match_index, parse_time, to_number
+from league.metrics import METRICS, timed
+from league.storage import DATA_FILES, HISTORY_DIR_NAME, JOURNAL_NAME, WRITER, DataStore, data_listener
 
 BASE_DIR = Path(__file__).resolve().parent
 DATA_DIR = BASE_DIR / "data"
 ADMIN_TOKEN = os.environ.get("BHML_ADMIN_TOKEN", "dev-token")
+# Leader base URL (e.g. http://10.0.0.2:8000). When set, this process runs as a read-only replica.
+FOLLOW_URL = os.environ.get("BHML_FOLLOW", "").rstrip("/")
+FOLLOW_INTERVAL = float(os.environ.get("BHML_FOLLOW_INTERVAL", "2"))
+QUERY_MAX_LIMIT = 500
+QUALIFY_SLOTS = 4
+# Static files up to this size are kept in memory; larger ones stream via wsgi.file_wrapper (sendfile).
+STATIC_MEMORY_MAX = int(os.environ.get("BHML_STATIC_MEMORY_MAX", str(64 * 1024)))
+STATIC_CACHE_ENTRIES = 512
+# Cached stat info is trusted this long before re-checking for edits made outside the fs API.
+STATIC_REVALIDATE = float(os.environ.get("BHML_STATIC_REVALIDATE", "1"))
+# Token buckets per client and route class as "class=rate/burst" (tokens per second); "off" disables.
+# Classes: static, data (public API reads), api, auth (failed admin tokens). Only auth is on by
+# default: behind a load balancer every viewer shares one address unless BHML_TRUST_PROXY is set.
+RATE_LIMITS = os.environ.get("BHML_RATE_LIMITS", "auth=0.1/10")
+RATE_LIMIT_CLIENTS = int(os.environ.get("BHML_RATE_LIMIT_CLIENTS", "10000"))
+# Take the client address from X-Forwarded-For (set this when behind a load balancer).
+TRUST_PROXY = os.environ.get("BHML_TRUST_PROXY", "") == "1"
+# Requests in flight above which reads are answered from cache (or 503) instead of doing work.
+SHED_THRESHOLD = int(os.environ.get("BHML_SHED_THRESHOLD", "64"))
+# GET routes that serve public data and count against the "data" class rather than "api".
+PUBLIC_API_RULES = {
+    "/api/matches", "/api/changes", "/api/standings", "/api/standings/outlook", "/api/search", "/api/ratings",
+    "/api/analytics/maps", "/api/export/player_stats",
+}
+SEARCH_MAX_LIMIT = 50
+# Column values interned into one shared "strings" table by layout=columnar.
+INTERNED_COLUMNS = {"player", "team", "teams.a", "teams.b"}
+# Rows per chunk (CSV) or record batch / row group (Arrow, Parquet) in the stats export.
+EXPORT_CHUNK_ROWS = 2000
+# Seasons simulated for /api/standings/outlook, and worker processes to spread them over (0 = in-process).
+SIMULATIONS = int(os.environ.get("BHML_SIMULATIONS", "100000"))
+SIM_WORKERS = int(os.environ.get("BHML_SIM_WORKERS", "0"))
+SIM_CHUNK = 20000
+PROFILE_MAX_SECONDS = 60
+# Extra seasons served by this process as "name=dir": /s/<name>/ serves <dir> (relative to the site
+# root) over the shared site files, with its data in <dir>/data.
+SEASONS_CONFIG = os.environ.get("BHML_SEASONS", "bhml=bhml")
+# "host=season" pairs that route a whole hostname to a season instead of the /s/<name>/ prefix.
+SEASON_HOSTS = os.environ.get("BHML_SEASON_HOSTS", "")
+# Seasons whose parsed data stays in memory; the least recently used beyond this are dropped.
+SEASONS_RESIDENT = int(os.environ.get("BHML_SEASONS_RESIDENT", "4"))
+# Data file bytes one season may keep parsed between requests; bigger seasons are re-read each time.
+SEASON_MEMORY_MAX = int(os.environ.get("BHML_SEASON_MEMORY_MAX", str(64 * 1024 * 1024)))
+# Leaf frames (file, function) that mean a thread is parked, not working; left out of profiles
+# unless idle=1. Matched on the stdlib file too, so busy code that happens to be called get/wait counts.
+PROFILE_IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("selectors.py", "select"),
+    ("socket.py", "accept"),
+    ("socket.py", "readinto"),
+}
 
 app = Flask(__name__, static_folder=None)
 
+METRICS.describe("bhml_requests_total", "counter", "HTTP requests by route, method and status.")
+METRICS.describe("bhml_request_seconds", "histogram", "HTTP request latency by route.")
+METRICS.describe("bhml_request_bytes_total", "counter", "Request body bytes received by route.")
+METRICS.describe("bhml_response_bytes_total", "counter", "Response body bytes sent by route.")
+METRICS.describe("bhml_rate_limited_total", "counter", "Requests rejected with 429 by route class.")
+METRICS.describe("bhml_shed_total", "counter", "Requests refused with 503 while shedding load.")
+
+
+STORE = DataStore(DATA_DIR)
+
+
+class Season:
+    def __init__(self, name: str, root: Path, store: DataStore):
+        self.name = name
+        self.root = root
+        self.store = store
+        self.prefix = f"/s/{name}" if name else ""
+        self.active = 0
+
+
+class SeasonRegistry:
+    """Seasons served by this process, keyed by name ("" is the site root's own season).
+
+    Stores stay open for every season (journals, followers); only parsed data is
+    evicted: seasons over ``SEASON_MEMORY_MAX`` after a request, and the least
+    recently used once more than ``SEASONS_RESIDENT`` hold parsed data.
+    """
+
+    def __init__(self):
+        self.seasons: Dict[str, Season] = {}
+        self.hosts: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._recent: "OrderedDict[str, None]" = OrderedDict()
+
+    def add(self, name: str, root: Path, store: Optional[DataStore] = None) -> Season:
+        season = Season(name, root, store or DataStore(root / "data"))
+        self.seasons[name] = season
+        return season
+
+    def get(self, name: str) -> Optional[Season]:
+        return self.seasons.get(name)
+
+    def enter(self, season: Season) -> None:
+        with self._lock:
+            season.active += 1
+            self._recent[season.name] = None
+            self._recent.move_to_end(season.name)
+
+    def leave(self, season: Season) -> None:
+        with self._lock:
+            season.active -= 1
+            resident = sum(1 for s in self.seasons.values() if s.store._cache)
+            for name in list(self._recent):
+                other = self.seasons[name]
+                if other.active or not other.store._cache:
+                    continue
+                if resident > SEASONS_RESIDENT or other.store.resident_bytes() > SEASON_MEMORY_MAX:
+                    other.store.unload()
+                    del self._recent[name]
+                    resident -= 1
+                    METRICS.inc("bhml_season_evictions_total", season=name or "default")
+
+    def owner(self, path: Path) -> Optional[Tuple[DataStore, str]]:
+        try:
+            resolved = path.resolve()
+        except OSError:
+            return None
+        if resolved.name not in DATA_FILES:
+            return None
+        for season in self.seasons.values():
+            if resolved.parent == season.store.data_dir.resolve():
+                return season.store, resolved.name
+        return None
+
+
+def _load_seasons() -> SeasonRegistry:
+    registry = SeasonRegistry()
+    registry.add("", BASE_DIR, STORE)
+    for item in filter(None, (part.strip() for part in SEASONS_CONFIG.split(","))):
+        name, _, rel = item.partition("=")
+        root = (BASE_DIR / rel.strip()).resolve()
+        if not re.fullmatch(r"[A-Za-z0-9_-]+", name.strip()) or not root.is_dir():
+            app.logger.warning("ignoring season %r", item)
+            continue
+        registry.add(name.strip(), root)
+    for item in filter(None, (part.strip() for part in SEASON_HOSTS.split(","))):
+        host, _, name = item.partition("=")
+        if name.strip() in registry.seasons:
+            registry.hosts[host.strip().lower()] = name.strip()
+    return registry
+
+
+METRICS.describe("bhml_season_evictions_total", "counter", "Times a season's parsed data was dropped from memory.")
+SEASONS = _load_seasons()
+
+
+class SeasonRouter:
+    """WSGI middleware picking the season from ``/s/<name>/...`` or the Host header.
+
+    The prefix moves to SCRIPT_NAME, so routes, relative URLs in the pages and
+    ``request.url_rule`` look the same for every season.
+    """
+
+    def __init__(self, wsgi_app):
+        self.wsgi_app = wsgi_app
+
+    def __call__(self, environ, start_response):
+        path = environ.get("PATH_INFO", "")
+        if path.startswith("/s/"):
+            name, slash, rest = path[3:].partition("/")
+            if not name or SEASONS.get(name) is None:
+                return NotFound()(environ, start_response)
+            if not slash:
+                query = environ.get("QUERY_STRING")
+                target = f"{environ.get('SCRIPT_NAME', '')}/s/{name}/" + (f"?{query}" if query else "")
+                return redirect(target, 308)(environ, start_response)
+            environ["SCRIPT_NAME"] = f"{environ.get('SCRIPT_NAME', '')}/s/{name}"
+            environ["PATH_INFO"] = f"/{rest}"
+        else:
+            host = environ.get("HTTP_HOST", "").rsplit(":", 1)[0].lower()
+            name = SEASONS.hosts.get(host, "")
+        environ["bhml.season"] = name
+        return self.wsgi_app(environ, start_response)
+
+
+app.wsgi_app = SeasonRouter(app.wsgi_app)
+
 
-def _read_json(path: Path) -> Dict[str, Any]:
-    if not path.exists():
-        return {}
-    return json.loads(path.read_text(encoding="utf-8"))
+def _season() -> Season:
+    season = g.get("season") if has_request_context() else None
+    return season or SEASONS.get("")
 
 
-def _write_json(path: Path, payload: Dict[str, Any]) -> None:
-    DATA_DIR.mkdir(parents=True, exist_ok=True)
-    tmp_path = path.with_suffix(path.suffix + ".tmp")
-    tmp_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
-    tmp_path.replace(path)
+def _store() -> DataStore:
+    return _season().store
+
+
+def _project(row: Dict[str, Any], fields: List[str]) -> Dict[str, Any]:
+    out: Dict[str, Any] = {}
+    for field in fields:
+        value: Any = row
+        parts = field.split(".")
+        for part in parts:
+            if not isinstance(value, dict) or part not in value:
+                break
+            value = value[part]
+        else:
+            target = out
+            for part in parts[:-1]:
+                target = target.setdefault(part, {})
+            target[parts[-1]] = value
+    return out
+
+
+def _encode_cursor(key: Tuple[float, str]) -> str:
+    raw = json.dumps([None if key[0] == float("inf") else key[0], key[1]], ensure_ascii=False)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Tuple[float, str]:
+    raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+    ts, match_id = json.loads(raw)
+    return (float("inf") if ts is None else float(ts), str(match_id))
+
+
+def _head_to_head(completed: List[Dict[str, Any]], id_a: str, id_b: str) -> int:
+    # First completed meeting in file order decides, as in app.js getHeadToHead.
+    for match in completed:
+        teams = match.get("teams") or {}
+        if {teams.get("a"), teams.get("b")} != {id_a, id_b}:
+            continue
+        score_a = to_number((match.get("score") or {}).get("a"))
+        score_b = to_number((match.get("score") or {}).get("b"))
+        if score_a is None or score_b is None or score_a == score_b:
+            return 0
+        winner = teams.get("a") if score_a > score_b else teams.get("b")
+        return 1 if winner == id_a else -1
+    return 0
+
+
+def _compute_standings(teams: Dict[str, Any], matches: List[Any]) -> List[Dict[str, Any]]:
+    """Server-side port of app.js renderStandings: win rate, then head-to-head."""
+    stats: Dict[str, Dict[str, Any]] = {
+        team_id: {"id": team_id, "wins": 0, "losses": 0, "results": []} for team_id in teams if team_id != "tba"
+    }
+    completed = [m for m in matches if isinstance(m, dict) and m.get("status") == "completed"]
+    for match in sorted(completed, key=lambda m: parse_time(m.get("time")) or 0):
+        team_a = (match.get("teams") or {}).get("a")
+        team_b = (match.get("teams") or {}).get("b")
+        if not team_a or not team_b:
+            continue
+        for team_id in (team_a, team_b):
+            if team_id != "tba" and team_id not in stats:
+                stats[team_id] = {"id": team_id, "wins": 0, "losses": 0, "results": []}
+        score_a = to_number((match.get("score") or {}).get("a"))
+        score_b = to_number((match.get("score") or {}).get("b"))
+        if score_a is None or score_b is None:
+            continue
+        for team_id, won in ((team_a, score_a > score_b), (team_b, score_b > score_a)):
+            if team_id in stats:
+                stats[team_id]["results"].append("W" if won else "L")
+        if score_a != score_b:
+            winner, loser = (team_a, team_b) if score_a > score_b else (team_b, team_a)
+            if winner in stats:
+                stats[winner]["wins"] += 1
+            if loser in stats:
+                stats[loser]["losses"] += 1
+
+    rows = []
+    for stat in stats.values():
+        total = stat["wins"] + stat["losses"]
+        results = stat.pop("results")
+        streak = ""
+        if results:
+            run = 0
+            for result in reversed(results):
+                if result != results[-1]:
+                    break
+                run += 1
+            streak = f"{results[-1]}{run}"
+        team = teams.get(stat["id"])
+        name = team.get("name", stat["id"]) if isinstance(team, dict) else stat["id"]
+        rows.append(dict(stat, name=name, win_rate=stat["wins"] / total if total else 0.0, streak=streak))
+
+    def compare(a: Dict[str, Any], b: Dict[str, Any]) -> int:
+        diff = b["win_rate"] - a["win_rate"]
+        if abs(diff) > 1e-9:
+            return 1 if diff > 0 else -1
+        return -_head_to_head(completed, a["id"], b["id"])
+
+    rows.sort(key=functools.cmp_to_key(compare))
+    next_rank = 1
+    for i, row in enumerate(rows):
+        prev = rows[i - 1] if i else None
+        same_rate = prev is not None and abs(prev["win_rate"] - row["win_rate"]) < 1e-9
+        prev_beat_me = same_rate and _head_to_head(completed, prev["id"], row["id"]) > 0
+        row["tied"] = bool(i and same_rate and not prev_beat_me)
+        if not row["tied"]:
+            row["rank"] = next_rank
+            next_rank += 1
+        else:
+            row["rank"] = prev["rank"]
+        row["qualified"] = i < QUALIFY_SLOTS
+    return rows
+
+
+def _simulate_chunk(
+    seed: int,
+    sims: int,
+    wins: np.ndarray,
+    games: np.ndarray,
+    home: np.ndarray,
+    away: np.ndarray,
+    p_home: np.ndarray,
+    h2h_fixed: np.ndarray,
+    h2h_match: np.ndarray,
+    slots: int,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Play out ``sims`` seasons; returns per-team (qualified, first place, total wins) counts.
+
+    Ties on win rate are broken by head-to-head wins among the tied teams, then by team
+    order, which is what the renderStandings comparator settles on for the usual two-way tie.
+    """
+    rng = np.random.default_rng(seed)
+    size = len(wins)
+    home_won = rng.random((sims, len(p_home))) < p_home
+    # Wins added per team = outcomes x one-hot schedule; a matmul beats scattering with np.add.at.
+    eye = np.eye(size, dtype=np.float32)
+    won = home_won.astype(np.float32)
+    final = wins + (won @ eye[home] + (1 - won) @ eye[away]).astype(np.int64)
+    win_rate = np.round(np.divide(final, games, out=np.zeros(final.shape), where=games > 0), 9)
+
+    # h2h[s, i, j] = 1 when i beat j in the meeting that decides their tiebreak.
+    h2h = np.broadcast_to(h2h_fixed, (sims, size, size)).copy()
+    pending = np.argwhere(h2h_match >= 0)
+    if len(pending):
+        i, j = pending[:, 0], pending[:, 1]
+        outcome = home_won[:, h2h_match[i, j]]
+        i_is_home = home[h2h_match[i, j]] == i
+        h2h[:, i, j] = np.where(outcome == i_is_home, 1, -1)
+    tied = win_rate[:, :, None] == win_rate[:, None, :]
+    tiebreak = ((h2h > 0) & tied).sum(axis=2)
+
+    order = np.lexsort((np.broadcast_to(np.arange(size), (sims, size)), -tiebreak, -win_rate), axis=-1)
+    qualified = np.bincount(order[:, :slots].ravel(), minlength=size)
+    first = np.bincount(order[:, 0], minlength=size)
+    return qualified, first, final.sum(axis=0)
+
+
+_SIM_POOLS: Dict[int, concurrent.futures.ProcessPoolExecutor] = {}
+_SIM_POOLS_LOCK = threading.Lock()
+if hasattr(os, "register_at_fork"):
+    # A forked child (gunicorn worker) must not share its parent's pool processes.
+    os.register_at_fork(after_in_child=_SIM_POOLS.clear)
+
+
+def _sim_pool(workers: int) -> concurrent.futures.ProcessPoolExecutor:
+    """One long-lived pool per size. Workers come from a forkserver (spawn where there is none),
+    never a fork of this process: its writer, follower and request threads may hold locks."""
+    with _SIM_POOLS_LOCK:
+        pool = _SIM_POOLS.get(workers)
+        if pool is None:
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            pool = _SIM_POOLS[workers] = concurrent.futures.ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context(method)
+            )
+        return pool
+
+
+def _simulate_outlook(
+    teams: Dict[str, Any], matches: List[Any], sims: int, seed: int, workers: int = 0
+) -> Dict[str, Any]:
+    """Monte Carlo outlook for the standings: qualification odds over the remaining schedule.
+
+    Each open match between two known teams is decided by log5 on the teams' current
+    win rates (with one win and one loss added so unplayed teams sit at 50%).
+    """
+    rows = _compute_standings(teams, matches)
+    ids = [row["id"] for row in rows]
+    position = {team_id: i for i, team_id in enumerate(ids)}
+    size = len(ids)
+
+    remaining, skipped = [], 0
+    meetings: Dict[frozenset, Optional[Tuple[int, Optional[int]]]] = {}
+    for match in matches:
+        if not isinstance(match, dict):
+            continue
+        pair = (match.get("teams") or {})
+        a, b = pair.get("a"), pair.get("b")
+        if match.get("status") == "completed":
+            if a in position and b in position:
+                meetings.setdefault(frozenset((a, b)), None)
+            continue
+        if a not in position or b not in position or a == b:
+            skipped += 1
+            continue
+        meetings.setdefault(frozenset((a, b)), (position[a], len(remaining)))
+        remaining.append((position[a], position[b]))
+
+    completed = [m for m in matches if isinstance(m, dict) and m.get("status") == "completed"]
+    h2h_fixed = np.zeros((size, size), dtype=np.int8)
+    h2h_match = np.full((size, size), -1, dtype=np.int64)
+    for pair, pending in meetings.items():
+        a, b = sorted(pair, key=position.get)
+        i, j = position[a], position[b]
+        if pending is None:
+            result = _head_to_head(completed, a, b)
+            h2h_fixed[i, j], h2h_fixed[j, i] = result, -result
+        else:
+            h2h_match[i, j] = h2h_match[j, i] = pending[1]
+
+    wins = np.array([row["wins"] for row in rows], dtype=np.int64)
+    losses = np.array([row["losses"] for row in rows], dtype=np.int64)
+    home = np.array([m[0] for m in remaining], dtype=np.int64)
+    away = np.array([m[1] for m in remaining], dtype=np.int64)
+    games = (wins + losses + np.bincount(home, minlength=size) + np.bincount(away, minlength=size)).astype(float)
+    strength = (wins + 1) / (wins + losses + 2)
+    s_home, s_away = strength[home], strength[away]
+    p_home = s_home * (1 - s_away) / (s_home * (1 - s_away) + s_away * (1 - s_home))
+
+    chunks = [min(SIM_CHUNK, sims - start) for start in range(0, sims, SIM_CHUNK)] if size else []
+    seeds = np.random.SeedSequence(seed).generate_state(len(chunks))
+    args = [
+        (int(chunk_seed), chunk, wins, games, home, away, p_home, h2h_fixed, h2h_match, QUALIFY_SLOTS)
+        for chunk_seed, chunk in zip(seeds, chunks)
+    ]
+    if workers > 0 and len(args) > 1:
+        pool = _sim_pool(workers)
+        try:
+            results = list(pool.map(_simulate_chunk, *zip(*args)))
+        except concurrent.futures.process.BrokenProcessPool:
+            # A worker died (OOM kill): start a fresh pool next time instead of failing forever.
+            with _SIM_POOLS_LOCK:
+                if _SIM_POOLS.get(workers) is pool:
+                    del _SIM_POOLS[workers]
+            raise
+    else:
+        results = [_simulate_chunk(*chunk_args) for chunk_args in args]
+    qualified = sum(r[0] for r in results)
+    first = sum(r[1] for r in results)
+    total_wins = sum(r[2] for r in results)
+
+    return {
+        "simulations": sims,
+        "remaining": len(remaining),
+        "skipped": skipped,
+        "teams": [
+            {
+                "id": row["id"],
+                "name": row["name"],
+                "wins": row["wins"],
+                "losses": row["losses"],
+                "remaining": int(games[i] - row["wins"] - row["losses"]),
+                "expected_wins": round(float(total_wins[i]) / sims, 2) if sims else float(row["wins"]),
+                "qualify": round(float(qualified[i]) / sims, 4) if sims else float(row["qualified"]),
+                "first": round(float(first[i]) / sims, 4) if sims else float(i == 0),
+            }
+            for i, row in enumerate(rows)
+        ],
+    }
+
+
+def _follow_loop(store: DataStore, leader: str) -> None:
+    headers = {"Authorization": f"Bearer {ADMIN_TOKEN}"}
+    while True:
+        since = store.seq if store.first_seq is not None else -1
+        try:
+            req = urllib.request.Request(f"{leader}/api/journal?since={since}", headers=headers)
+            with urllib.request.urlopen(req, timeout=10) as resp:
+                body = json.loads(resp.read().decode("utf-8"))
+            for entry in body.get("entries", []):
+                if entry.get("full") or int(entry["seq"]) > store.seq:
+                    store.apply(entry)
+            if body.get("more"):
+                continue
+        except (urllib.error.URLError, OSError, ValueError, KeyError) as e:
+            app.logger.warning("follow %s failed: %s", leader, e)
+        time.sleep(FOLLOW_INTERVAL)
+
+
+def _start_follower(store: DataStore, leader: str) -> None:
+    store.read_only = True
+    threading.Thread(target=_follow_loop, args=(store, leader), name="bhml-follower", daemon=True).start()
+
+
+class RateLimiter:
+    """Token buckets keyed by (client, route class) in an LRU-bounded table."""
+
+    def __init__(self, spec: str, max_clients: int = RATE_LIMIT_CLIENTS):
+        self.enabled = spec.strip().lower() not in ("", "off", "0")
+        self.limits: Dict[str, Tuple[float, float]] = {}
+        if self.enabled:
+            for part in spec.split(","):
+                name, _, value = part.partition("=")
+                rate, _, burst = value.partition("/")
+                self.limits[name.strip()] = (float(rate), float(burst or rate))
+        self.max_clients = max_clients
+        self._lock = threading.Lock()
+        self._buckets: "OrderedDict[Tuple[str, str], List[float]]" = OrderedDict()
+
+    def _bucket(self, key: Tuple[str, str], now: float) -> Optional[List[float]]:
+        limit = self.limits.get(key[1])
+        if limit is None:
+            return None
+        rate, burst = limit
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [burst, now]
+            if len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            bucket[0] = min(burst, bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+        return bucket
+
+    def take(self, client: str, route_class: str, cost: float = 1.0) -> float:
+        """Spend ``cost`` tokens; returns 0 when allowed, else seconds until it would be."""
+        if not self.enabled:
+            return 0.0
+        with self._lock:
+            bucket = self._bucket((client, route_class), time.monotonic())
+            if bucket is None:
+                return 0.0
+            if bucket[0] >= cost:
+                bucket[0] -= cost
+                return 0.0
+            rate = self.limits[route_class][0]
+            return (cost - bucket[0]) / rate if rate > 0 else 60.0
+
+    def available(self, client: str, route_class: str) -> float:
+        if not self.enabled:
+            return float("inf")
+        with self._lock:
+            bucket = self._bucket((client, route_class), time.monotonic())
+            return float("inf") if bucket is None else bucket[0]
+
+
+LIMITER = RateLimiter(RATE_LIMITS)
+_INFLIGHT = [0]
+_INFLIGHT_LOCK = threading.Lock()
+
+
+def _client_ip() -> str:
+    if TRUST_PROXY:
+        forwarded = request.headers.get("X-Forwarded-For", "")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.remote_addr or "unknown"
+
+
+def _route_class() -> str:
+    rule = request.url_rule.rule if request.url_rule is not None else ""
+    if rule.startswith("/api/") or rule == "/metrics":
+        return "data" if request.method == "GET" and rule in PUBLIC_API_RULES else "api"
+    if request.path.startswith("/data/"):
+        return "data"
+    return "static"
 
 
 def _get_token() -> str:
@@ -33,16 +607,19 @@ def _get_token() -> str:
 
 
 def _require_auth() -> bool:
-    return _get_token() == ADMIN_TOKEN
+    if _get_token() == ADMIN_TOKEN:
+        return True
+    LIMITER.take(_client_ip(), "auth")
+    return False
 
 
-IGNORED_DIRS = {'.git', '.venv', '__pycache__', '.idea', '.vscode'}
-IGNORED_FILES = {'server.py', 'bhml.db'}
+IGNORED_DIRS = {'.git', '.venv', '__pycache__', '.idea', '.vscode', 'league', HISTORY_DIR_NAME}
+IGNORED_FILES = {'server.py', 'bhml.db', JOURNAL_NAME}
 
-def _is_safe_path(path_str: str) -> bool:
+def _is_safe_path(path_str: str, root: Path) -> bool:
     try:
-        requested_path = (BASE_DIR / path_str).resolve()
-        return BASE_DIR in requested_path.parents or requested_path.parent == BASE_DIR
+        requested_path = (root / path_str).resolve()
+        return root in requested_path.parents or requested_path.parent == root
     except Exception:
         return False
 
@@ -52,11 +629,13 @@ def api_fs_list():
         return jsonify({"error": "unauthorized"}), 401
     
     files_list = []
+    site_root = _season().root
     # Use followlinks=True to ensure symlinked directories are traversed
-    for root, dirs, files in os.walk(BASE_DIR, followlinks=True):
+    walk_started = time.perf_counter()
+    for root, dirs, files in os.walk(site_root, followlinks=True):
         dirs[:] = [d for d in dirs if d not in IGNORED_DIRS]
         
-        rel_root = Path(root).relative_to(BASE_DIR)
+        rel_root = Path(root).relative_to(site_root)
         
         # Include directories in the list if they are not the root
         for d in dirs:
@@ -72,6 +651,7 @@ def api_fs_list():
             path_str = f if str(full_rel_path) == "." else str(full_rel_path).replace("\\", "/")
             files_list.append(path_str)
                      
+    METRICS.observe("bhml_io_seconds", time.perf_counter() - walk_started, op="fs_walk")
     files_list.sort()
     return jsonify({"files": files_list})
 
@@ -84,10 +664,11 @@ def api_fs_file():
     if not path_param:
         return jsonify({"error": "missing_path"}), 400
         
-    if not _is_safe_path(path_param):
+    site_root = _season().root
+    if not _is_safe_path(path_param, site_root):
          return jsonify({"error": "invalid_path"}), 403
 
-    target_path = BASE_DIR / path_param
+    target_path = site_root / path_param
     
     if request.method == "GET":
         if not target_path.exists():
@@ -103,9 +684,23 @@ def api_fs_file():
         if not payload or "content" not in payload:
              return jsonify({"error": "missing_content"}), 400
         
+        # Data files go through the store that owns them, whichever season's root the path was given under.
+        owner = SEASONS.owner(target_path)
+        if owner:
+            store, data_name = owner
+            if store.read_only:
+                return jsonify({"error": "read_only_replica"}), 409
+            try:
+                doc = json.loads(payload["content"])
+            except ValueError:
+                doc = None
+            if isinstance(doc, dict):
+                seq = store.write(data_name, doc)
+                return jsonify({"ok": True, "seq": seq})
+
         try:
-            target_path.parent.mkdir(parents=True, exist_ok=True)
-            target_path.write_text(payload["content"], encoding="utf-8")
+            WRITER.submit_file(target_path, payload["content"])
+            STATIC.invalidate(target_path)
             return jsonify({"ok": True})
         except Exception as e:
             return jsonify({"error": str(e)}), 500
@@ -128,63 +723,827 @@ def api_fs_upload():
     if not requested_path:
         requested_path = file_obj.filename
 
-    if not _is_safe_path(requested_path):
+    site_root = _season().root
+    if not _is_safe_path(requested_path, site_root):
         return jsonify({"error": "invalid_path"}), 403
 
-    target_path = (BASE_DIR / requested_path).resolve()
+    target_path = (site_root / requested_path).resolve()
+    content = file_obj.read()
+    owner = SEASONS.owner(target_path)
+    if owner:
+        store, data_name = owner
+        if store.read_only:
+            return jsonify({"error": "read_only_replica"}), 409
+        try:
+            doc = json.loads(content)
+        except ValueError:
+            doc = None
+        if not isinstance(doc, dict):
+            return jsonify({"error": "invalid_json", "hint": "Data files must hold a JSON object."}), 400
+        seq = store.write(data_name, doc)
+        return jsonify({"ok": True, "path": requested_path, "seq": seq})
+
     try:
-        target_path.parent.mkdir(parents=True, exist_ok=True)
-        file_obj.save(str(target_path))
+        WRITER.submit_file(target_path, content)
+        STATIC.invalidate(target_path)
         return jsonify({"ok": True, "path": requested_path})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 @app.route("/api/teams", methods=["GET", "POST"])
 def api_teams():
+    store = _store()
     if not _require_auth():
         return jsonify({"error": "unauthorized"}), 401
 
     if request.method == "GET":
-        return jsonify(_read_json(DATA_DIR / "teams.json"))
+        return jsonify(store.read("teams.json"))
+
+    if store.read_only:
+        return jsonify({"error": "read_only_replica"}), 409
 
     payload = request.get_json(silent=True)
     if not isinstance(payload, dict) or "teams" not in payload:
         return jsonify({"error": "invalid_payload", "hint": "Expected object with 'teams'."}), 400
 
-    _write_json(DATA_DIR / "teams.json", payload)
-    return jsonify({"ok": True})
+    seq = store.write("teams.json", payload)
+    return jsonify({"ok": True, "seq": seq})
+
+
+QUERY_PARAMS = {"status", "team", "stage", "since", "until", "fields", "limit", "cursor", "order"}
+
+
+def _columns(rows: List[Dict[str, Any]], strings: Dict[str, int]) -> Dict[str, List[Any]]:
+    """Row dicts -> {column: values}. Flat sub-objects become "key.sub" columns and
+    names in ``INTERNED_COLUMNS`` become indexes into ``strings``."""
+    flat = []
+    for row in rows:
+        out: Dict[str, Any] = {}
+        for key, value in row.items():
+            if isinstance(value, dict) and not any(isinstance(v, (dict, list)) for v in value.values()):
+                for sub, sub_value in value.items():
+                    out[f"{key}.{sub}"] = sub_value
+            else:
+                out[key] = value
+        flat.append(out)
+    columns: Dict[str, List[Any]] = {}
+    for name in dict.fromkeys(key for row in flat for key in row):
+        values = [row.get(name) for row in flat]
+        if name in INTERNED_COLUMNS:
+            values = [None if v is None else strings.setdefault(str(v), len(strings)) for v in values]
+        columns[name] = values
+    return columns
+
+
+def _columnar_matches(doc: Dict[str, Any]) -> Dict[str, Any]:
+    # matches -> maps -> player_stats become three tables linked by row index.
+    match_rows, map_rows, stat_rows = [], [], []
+    for match in doc.get("matches") or []:
+        if not isinstance(match, dict):
+            continue
+        match_rows.append({k: v for k, v in match.items() if k != "maps"})
+        for game_map in match.get("maps") or []:
+            if not isinstance(game_map, dict):
+                continue
+            map_rows.append(dict({k: v for k, v in game_map.items() if k != "player_stats"}, match=len(match_rows) - 1))
+            for row in game_map.get("player_stats") or []:
+                if isinstance(row, dict):
+                    stat_rows.append(dict(row, map=len(map_rows) - 1))
+    strings: Dict[str, int] = {}
+    tables = {
+        "matches": _columns(match_rows, strings),
+        "maps": _columns(map_rows, strings),
+        "player_stats": _columns(stat_rows, strings),
+    }
+    rest = {k: v for k, v in doc.items() if k != "matches"}
+    return dict(rest, layout="columnar", strings=list(strings), **tables)
+
+
+def _columnar_ratings(doc: Dict[str, Any]) -> Dict[str, Any]:
+    strings: Dict[str, int] = {}
+    if "maps" in doc:
+        maps = [{k: v for k, v in m.items() if k != "players"} for m in doc["maps"]]
+        players = [dict(row, map=i) for i, m in enumerate(doc["maps"]) for row in m["players"]]
+        tables = {"maps": _columns(maps, strings), "players": _columns(players, strings)}
+    else:
+        tables = {"players": _columns(doc["players"], strings)}
+    rest = {k: v for k, v in doc.items() if k not in ("maps", "players")}
+    return dict(rest, layout="columnar", strings=list(strings), **tables)
+
+
+def _encoded(doc: Dict[str, Any], columnar: Callable[[Dict[str, Any]], Dict[str, Any]]):
+    """Respond with ``doc`` as asked by ?format=json|msgpack and ?layout=rows|columnar."""
+    fmt = request.args.get("format", "json")
+    layout = request.args.get("layout", "rows")
+    if fmt not in ("json", "msgpack") or layout not in ("rows", "columnar"):
+        return jsonify({"error": "invalid_format", "hint": "format=json|msgpack, layout=rows|columnar"}), 400
+    if fmt == "msgpack" and msgpack is None:
+        return jsonify({"error": "not_acceptable", "hint": "msgpack is not installed on this server."}), 406
+    if layout == "columnar":
+        doc = columnar(doc)
+    if fmt == "msgpack":
+        return Response(msgpack.packb(doc, use_bin_type=True), mimetype="application/msgpack")
+    return jsonify(doc)
+
+
+def _query_matches():
+    store = _store()
+    args = request.args
+    since = until = after = None
+    try:
+        if args.get("since"):
+            since = parse_time(args["since"])
+            if since is None:
+                raise ValueError("since")
+        if args.get("until"):
+            until = parse_time(args["until"])
+            if until is None:
+                raise ValueError("until")
+        limit = min(int(args.get("limit", QUERY_MAX_LIMIT)), QUERY_MAX_LIMIT)
+        if limit < 1:
+            raise ValueError("limit")
+        if args.get("cursor"):
+            after = _decode_cursor(args["cursor"])
+    except (ValueError, TypeError):
+        return jsonify({"error": "invalid_query"}), 400
+
+    index = match_index(store)
+    status = [s for s in args.get("status", "").split(",") if s] or None
+    positions = index.query(
+        status=status,
+        team=args.get("team") or None,
+        stage=args.get("stage") or None,
+        since=since,
+        until=until,
+        after=after,
+        descending=args.get("order") == "desc",
+    )
+    page = positions[:limit]
+    fields = [f for f in args.get("fields", "").split(",") if f]
+    rows = [_project(index.rows[pos], fields) if fields else index.rows[pos] for pos in page]
+    next_cursor = _encode_cursor(index.keys[page[-1]]) if len(positions) > limit else None
+    return _encoded({"matches": rows, "next_cursor": next_cursor, "version": store.seq}, _columnar_matches)
 
 
 @app.route("/api/matches", methods=["GET", "POST"])
 def api_matches():
+    store = _store()
+    if request.method == "GET":
+        # Same data as the public data/matches.json, so reads need no token.
+        if QUERY_PARAMS.intersection(request.args):
+            return _query_matches()
+        return _encoded(store.read("matches.json"), _columnar_matches)
+
     if not _require_auth():
         return jsonify({"error": "unauthorized"}), 401
 
-    if request.method == "GET":
-        return jsonify(_read_json(DATA_DIR / "matches.json"))
+    if store.read_only:
+        return jsonify({"error": "read_only_replica"}), 409
 
     payload = request.get_json(silent=True)
     if not isinstance(payload, dict) or "matches" not in payload:
         return jsonify({"error": "invalid_payload", "hint": "Expected object with 'matches'."}), 400
 
-    _write_json(DATA_DIR / "matches.json", payload)
-    return jsonify({"ok": True})
+    seq = store.write("matches.json", payload)
+    return jsonify({"ok": True, "seq": seq})
+
+
+@app.route("/api/journal", methods=["GET"])
+def api_journal():
+    store = _store()
+    if not _require_auth():
+        return jsonify({"error": "unauthorized"}), 401
+
+    try:
+        since = int(request.args.get("since", "0"))
+        limit = max(1, min(int(request.args.get("limit", "100")), 1000))
+    except ValueError:
+        return jsonify({"error": "invalid_since"}), 400
+
+    entries = store.entries_since(since, limit)
+    more = bool(entries) and not entries[-1].get("full") and entries[-1]["seq"] < store.seq
+    return jsonify({"seq": store.seq, "entries": entries, "more": more})
+
+
+@app.route("/api/changes", methods=["GET"])
+def api_changes():
+    store = _store()
+    try:
+        since = int(request.args.get("since", "-1"))
+    except ValueError:
+        return jsonify({"error": "invalid_since"}), 400
+
+    docs = {name: store.read(name) for name in DATA_FILES}
+    version = store.seq
+    if since < store.changes.floor or since > version:
+        return jsonify({"version": version, "full_reload": True})
+    return jsonify({"version": version, "since": since, "changes": store.changes.since(since, docs)})
+
+
+@app.route("/api/search", methods=["GET"])
+def api_search():
+    store = _store()
+    query = request.args.get("q", "").strip()
+    if not query:
+        return jsonify({"error": "missing_query"}), 400
+    try:
+        limit = max(1, min(int(request.args.get("limit", "20")), SEARCH_MAX_LIMIT))
+    except ValueError:
+        return jsonify({"error": "invalid_limit"}), 400
+    kinds = {k for k in request.args.get("type", "").split(",") if k} or None
+
+    for name in DATA_FILES:
+        store.read(name)
+    index = store.derived.get("search") or SearchIndex()
+    return jsonify({"query": query, "results": index.search(query, limit, kinds)})
+
+
+@app.route("/api/ratings", methods=["GET"])
+def api_ratings():
+    store = _store()
+    store.read("matches.json")
+    index = store.derived.get("ratings") or RatingIndex()
+    match_id = request.args.get("match")
+    if match_id:
+        return _encoded({"match": match_id, "maps": index.for_match(match_id)}, _columnar_ratings)
+
+    board = index.leaderboard()
+    player = request.args.get("player")
+    if player:
+        board = [row for row in board if row["player"] == player]
+    team = request.args.get("team")
+    if team:
+        board = [row for row in board if row["team"] == team]
+    return _encoded({"version": store.seq, "players": board}, _columnar_ratings)
+
+
+EXPORT_COLUMNS = ("match_id", "time", "stage", "map_index", "map", "player", "team", "k", "d", "a", "adr", "rating")
+
+
+def _player_stat_rows(matches: List[Any]) -> Iterator[Tuple[Any, ...]]:
+    for match in matches:
+        if not isinstance(match, dict):
+            continue
+        for j, game_map in enumerate(match.get("maps") or []):
+            if not isinstance(game_map, dict):
+                continue
+            for row in game_map.get("player_stats") or []:
+                if not isinstance(row, dict):
+                    continue
+                counts = [to_number(row.get(key)) for key in ("k", "d", "a")]
+                yield (
+                    match.get("id"), match.get("time"), match.get("stage"), j, game_map.get("name"),
+                    row.get("player"), row.get("team"),
+                    *(int(n) if n is not None and n.is_integer() else n for n in counts),
+                    to_number(row.get("adr")), to_number(row.get("rating")),
+                )
+
+
+def _chunked(rows: Iterator[Tuple[Any, ...]], size: int) -> Iterator[List[Tuple[Any, ...]]]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _export_csv(matches: List[Any]) -> Iterator[str]:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(EXPORT_COLUMNS)
+    for chunk in _chunked(_player_stat_rows(matches), EXPORT_CHUNK_ROWS):
+        writer.writerows(chunk)
+        yield buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+    if buf.tell():
+        yield buf.getvalue()
+
+
+def _export_arrow(matches: List[Any], parquet: bool) -> Iterator[bytes]:
+    schema = pyarrow.schema(
+        [(name, pyarrow.string()) for name in EXPORT_COLUMNS[:3]]
+        + [("map_index", pyarrow.int32()), ("map", pyarrow.string()), ("player", pyarrow.string()), ("team", pyarrow.string())]
+        + [(name, pyarrow.float64()) for name in EXPORT_COLUMNS[7:]]
+    )
+    sink = io.BytesIO()
+    writer = pyarrow.parquet.ParquetWriter(sink, schema) if parquet else pyarrow.ipc.new_stream(sink, schema)
+    for chunk in _chunked(_player_stat_rows(matches), EXPORT_CHUNK_ROWS):
+        columns = list(zip(*chunk))
+        batch = pyarrow.record_batch([pyarrow.array(col, type=field.type) for col, field in zip(columns, schema)], schema=schema)
+        if parquet:
+            writer.write_table(pyarrow.Table.from_batches([batch]))
+        else:
+            writer.write_batch(batch)
+        yield sink.getvalue()
+        sink.seek(0)
+        sink.truncate()
+    writer.close()
+    yield sink.getvalue()
+
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+
+@app.route("/api/export/player_stats", methods=["GET"])
+def api_export_player_stats():
+    fmt = request.args.get("format", "csv")
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({"error": "invalid_format", "hint": "format=csv|arrow|parquet"}), 400
+    if fmt != "csv" and pyarrow is None:
+        return jsonify({"error": "not_acceptable", "hint": "pyarrow is not installed on this server."}), 406
+
+    # The generator keeps this parsed snapshot; later writes replace the cached doc rather than mutate it.
+    matches = _store().read("matches.json").get("matches") or []
+    body = _export_csv(matches) if fmt == "csv" else _export_arrow(matches, parquet=fmt == "parquet")
+    mimetype, ext = EXPORT_FORMATS[fmt]
+    headers = {"Content-Disposition": f"attachment; filename=player_stats.{ext}"}
+    return Response(body, mimetype=mimetype, headers=headers)
+
+
+@app.route("/api/analytics/maps", methods=["GET"])
+def api_analytics_maps():
+    store = _store()
+    store.read("matches.json")
+    view = (store.derived.get("analytics") or MapAnalytics()).view()
+    team = request.args.get("team")
+    if team:
+        return jsonify({"version": store.seq, "team": team, **view["teams"].get(team, {"vetoes": 0, "first_bans": 0, "maps": {}})})
+    return jsonify({"version": store.seq, **view})
+
+
+@app.route("/api/standings", methods=["GET"])
+def api_standings():
+    store = _store()
+    teams = store.read("teams.json").get("teams") or {}
+    matches = store.read("matches.json").get("matches") or []
+    return jsonify({"version": store.seq, "standings": _compute_standings(teams, matches)})
+
+
+@app.route("/api/standings/outlook", methods=["GET"])
+def api_standings_outlook():
+    store = _store()
+    # One run per data version and season; concurrent requests for the same season wait for it
+    # instead of simulating again, other seasons are not held up.
+    with store.derived.setdefault("outlook_lock", threading.Lock()):
+        teams = store.read("teams.json").get("teams") or {}
+        matches = store.read("matches.json").get("matches") or []
+        version = store.seq
+        cached = store.derived.get("outlook")
+        if cached is None or cached[0] != version:
+            started = time.perf_counter()
+            outlook = _simulate_outlook(teams, matches, SIMULATIONS, seed=max(version, 0), workers=SIM_WORKERS)
+            METRICS.observe("bhml_io_seconds", time.perf_counter() - started, op="simulate")
+            cached = store.derived["outlook"] = (version, outlook)
+    return jsonify(dict(cached[1], version=cached[0]))
+
+
+@app.route("/api/history", methods=["GET"])
+def api_history():
+    store = _store()
+    if not _require_auth():
+        return jsonify({"error": "unauthorized"}), 401
+
+    name = request.args.get("file", "matches.json")
+    if name not in DATA_FILES:
+        return jsonify({"error": "invalid_file"}), 400
+
+    # Reading first snapshots the on-disk file as version 1 if nothing has been recorded yet.
+    store.read(name)
+    version = request.args.get("version")
+    if version is not None:
+        if not version.isdigit():
+            return jsonify({"error": "invalid_version"}), 400
+        try:
+            return jsonify(store.history.load(name, int(version)))
+        except FileNotFoundError:
+            return jsonify({"error": "not_found"}), 404
+
+    return jsonify({
+        "file": name,
+        "current": store.history.current(name),
+        "versions": store.history.list(name),
+    })
+
+
+@app.route("/api/history/rollback", methods=["POST"])
+def api_history_rollback():
+    store = _store()
+    if not _require_auth():
+        return jsonify({"error": "unauthorized"}), 401
+    if store.read_only:
+        return jsonify({"error": "read_only_replica"}), 409
+
+    payload = request.get_json(silent=True) or {}
+    name = payload.get("file")
+    if name not in DATA_FILES or not isinstance(payload.get("version"), int):
+        return jsonify({"error": "invalid_payload", "hint": "Expected object with 'file' and integer 'version'."}), 400
+
+    try:
+        seq = WRITER.submit_rollback(store, name, payload["version"])
+    except FileNotFoundError:
+        return jsonify({"error": "not_found"}), 404
+    return jsonify({"ok": True, "seq": seq, "version": payload["version"]})
+
+
+class SamplingProfiler:
+    """Samples Python stacks of running threads via ``sys._current_frames``.
+
+    Output is in collapsed-stack form (``thread;outer;...;inner count`` per line),
+    ready for flamegraph.pl or speedscope.
+    """
+
+    def __init__(
+        self,
+        hz: float = 100,
+        thread_ids: Optional[set] = None,
+        exclude: Optional[set] = None,
+        include_idle: bool = False,
+    ):
+        self.interval = 1.0 / max(1.0, min(hz, 1000.0))
+        self.thread_ids = thread_ids
+        self.exclude = exclude or set()
+        self.include_idle = include_idle
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _sample(self) -> None:
+        own = threading.get_ident()
+        names = {t.ident: t.name for t in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own or thread_id in self.exclude:
+                continue
+            if self.thread_ids is not None and thread_id not in self.thread_ids:
+                continue
+            leaf = (Path(frame.f_code.co_filename).name, frame.f_code.co_name)
+            if not self.include_idle and leaf in PROFILE_IDLE_FRAMES:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+                frame = frame.f_back
+            stack.append(names.get(thread_id, str(thread_id)))
+            self.samples[";".join(reversed(stack))] += 1
+
+    def _run(self, deadline: float) -> None:
+        while not self._stop.is_set() and time.monotonic() < deadline:
+            self._sample()
+            self._stop.wait(self.interval)
+
+    def start(self, seconds: float = PROFILE_MAX_SECONDS) -> "SamplingProfiler":
+        self._thread = threading.Thread(
+            target=self._run, args=(time.monotonic() + seconds,), name="bhml-profiler", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> str:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return "\n".join(f"{stack} {count}" for stack, count in self.samples.most_common()) + "\n"
+
+
+_PROFILE_LOCK = threading.Lock()
+# Most recent per-request profiles, looked up by the X-Profile-Id response header.
+_REQUEST_PROFILES: "deque[Tuple[str, str]]" = deque(maxlen=32)
+
+
+@app.before_request
+def _start_timer():
+    g.request_started = time.perf_counter()
+
+
+@app.before_request
+def _enter_season():
+    season = SEASONS.get(request.environ.get("bhml.season", "")) or SEASONS.get("")
+    SEASONS.enter(season)
+    g.season = season
+
+
+@app.teardown_request
+def _leave_season(exc):
+    season = g.pop("season", None)
+    if season is not None:
+        SEASONS.leave(season)
+
+
+def _too_many(retry_after: float):
+    response = jsonify({"error": "rate_limited"})
+    response.status_code = 429
+    response.headers["Retry-After"] = str(max(1, int(retry_after + 0.999)))
+    return response
+
+
+def _shed():
+    # Serve what is already in memory, however stale; refuse anything that needs work.
+    if request.method == "GET" and request.url_rule is not None:
+        if request.url_rule.rule == "/<path:path>" or request.path in ("/", "/admin"):
+            filename = {"/": "index.html", "/admin": "admin.html"}.get(request.path, request.path.lstrip("/"))
+            entry = STATIC.cached(filename, _static_roots(filename))
+            if entry is not None and entry.body is not None:
+                return Response(entry.body, mimetype=entry.mimetype, headers={"ETag": entry.etag, "X-Stale": "1"})
+        if request.url_rule.rule == "/api/matches" and not request.args:
+            cached = _store()._cache.get("matches.json")
+            if cached is not None:
+                response = jsonify(cached[1])
+                response.headers["X-Stale"] = "1"
+                return response
+    METRICS.inc("bhml_shed_total", route_class=_route_class())
+    response = jsonify({"error": "overloaded"})
+    response.status_code = 503
+    response.headers["Retry-After"] = "1"
+    return response
+
+
+@app.before_request
+def _limit_request():
+    with _INFLIGHT_LOCK:
+        _INFLIGHT[0] += 1
+        inflight = _INFLIGHT[0]
+    g.counted_inflight = True
+    client = _client_ip()
+    route_class = _route_class()
+    if route_class == "api" and _get_token() != ADMIN_TOKEN and LIMITER.available(client, "auth") < 1:
+        # Too many bad tokens from this client: stop checking its guesses for a while. Requests
+        # carrying the right token (admins, replicas polling the journal) are never locked out.
+        METRICS.inc("bhml_rate_limited_total", route_class="auth")
+        return _too_many(LIMITER.take(client, "auth"))
+    wait = LIMITER.take(client, route_class)
+    if wait:
+        METRICS.inc("bhml_rate_limited_total", route_class=route_class)
+        return _too_many(wait)
+    if inflight > SHED_THRESHOLD and not (request.method == "POST" and _get_token() == ADMIN_TOKEN):
+        return _shed()
+
+
+@app.teardown_request
+def _release_inflight(exc):
+    if g.pop("counted_inflight", False):
+        with _INFLIGHT_LOCK:
+            _INFLIGHT[0] -= 1
+
+
+@app.before_request
+def _start_request_profile():
+    if request.headers.get("X-Profile") and _require_auth():
+        g.profiler = SamplingProfiler(hz=1000, thread_ids={threading.get_ident()}, include_idle=True).start()
+
+
+@app.after_request
+def _finish_request_profile(response):
+    profiler = g.pop("profiler", None)
+    if profiler is not None:
+        profile_id = f"{time.time_ns():x}"
+        _REQUEST_PROFILES.append((profile_id, profiler.stop()))
+        response.headers["X-Profile-Id"] = profile_id
+    return response
+
+
+@app.after_request
+def _record_request(response):
+    started = g.get("request_started")
+    if started is None:
+        return response
+    route = request.url_rule.rule if request.url_rule is not None else "unmatched"
+    METRICS.observe("bhml_request_seconds", time.perf_counter() - started, route=route, method=request.method)
+    METRICS.inc("bhml_requests_total", route=route, method=request.method, status=str(response.status_code))
+    if request.content_length:
+        METRICS.inc("bhml_request_bytes_total", request.content_length, route=route)
+    if response.content_length:
+        METRICS.inc("bhml_response_bytes_total", response.content_length, route=route)
+    return response
+
+
+METRICS.gauge(
+    "bhml_data_version",
+    "Latest journal sequence applied to this process, by season.",
+    lambda: {name or "default": season.store.seq for name, season in SEASONS.seasons.items()},
+    label="season",
+)
+METRICS.gauge("bhml_writer_queue_depth", "Writes waiting for the writer thread.", lambda: WRITER._queue.qsize())
+METRICS.gauge("bhml_requests_in_flight", "Requests currently being handled.", lambda: _INFLIGHT[0])
+
+
+@app.route("/metrics", methods=["GET"])
+def metrics():
+    return Response(METRICS.render(), mimetype="text/plain; version=0.0.4")
+
+
+class _StaticEntry:
+    __slots__ = ("path", "size", "mtime", "mtime_ns", "etag", "mimetype", "body", "checked")
+
+    def __init__(self, path: Path, st: os.stat_result, body: Optional[bytes]):
+        self.path = path
+        self.size = st.st_size
+        self.mtime = st.st_mtime
+        self.mtime_ns = st.st_mtime_ns
+        self.etag = f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+        self.mimetype = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        self.body = body
+        self.checked = time.monotonic()
+
+
+class StaticFiles:
+    """Static file server with cached path resolution, stat info and ETags.
+
+    Small files are served from memory, larger ones through ``wsgi.file_wrapper`` so
+    servers that support it (gunicorn, uWSGI) hand them to ``sendfile``. Entries are
+    dropped by :meth:`invalidate` when the fs API or a data commit writes a file, and
+    re-stat'ed every ``STATIC_REVALIDATE`` seconds to catch edits made elsewhere.
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, _StaticEntry]" = OrderedDict()
+
+    def _load(self, root: Path, filename: str) -> Optional[_StaticEntry]:
+        joined = safe_join(str(root), filename)
+        if joined is None:
+            return None
+        path = Path(joined)
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        if not path.is_file():
+            return None
+        body = path.read_bytes() if st.st_size <= STATIC_MEMORY_MAX else None
+        return _StaticEntry(path, st, body)
+
+    def lookup(self, filename: str, root: Optional[Path] = None) -> Optional[_StaticEntry]:
+        root = root or self.root
+        key = (str(root), filename)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is not None and time.monotonic() - entry.checked < STATIC_REVALIDATE:
+            METRICS.inc("bhml_cache_requests_total", cache="static", result="hit")
+            return entry
+        if entry is not None:
+            try:
+                st = entry.path.stat()
+            except OSError:
+                st = None
+            if st is not None and (st.st_mtime_ns, st.st_size) == (entry.mtime_ns, entry.size):
+                entry.checked = time.monotonic()
+                METRICS.inc("bhml_cache_requests_total", cache="static", result="hit")
+                return entry
+        METRICS.inc("bhml_cache_requests_total", cache="static", result="miss")
+        entry = self._load(root, filename)
+        with self._lock:
+            if entry is None:
+                self._entries.pop(key, None)
+                return None
+            self._entries[key] = entry
+            while len(self._entries) > STATIC_CACHE_ENTRIES:
+                self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self, path: Optional[Path] = None) -> None:
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                return
+            target = Path(path).resolve()
+            for key in [k for k, e in self._entries.items() if e.path.resolve() == target]:
+                del self._entries[key]
+
+    def cached(self, filename: str, roots: List[Path]) -> Optional[_StaticEntry]:
+        for root in roots:
+            entry = self._entries.get((str(root), filename))
+            if entry is not None:
+                return entry
+        return None
+
+    def serve(self, filename: str, roots: Optional[List[Path]] = None) -> Response:
+        """Serve ``filename`` from the first of ``roots`` that has it (a season's own files, then the shared site)."""
+        roots = roots or [self.root]
+        if request.range is not None:
+            # Partial content is rare here (no media streams); let Werkzeug handle it.
+            for root in roots[:-1]:
+                joined = safe_join(str(root), filename)
+                if joined is not None and os.path.isfile(joined):
+                    return send_from_directory(root, filename)
+            return send_from_directory(roots[-1], filename)
+        entry = None
+        for root in roots:
+            entry = self.lookup(filename, root)
+            if entry is not None:
+                break
+        if entry is None:
+            raise NotFound()
+        headers = {"ETag": entry.etag, "Last-Modified": http_date(entry.mtime), "Cache-Control": "no-cache"}
+        if entry.etag in request.headers.get("If-None-Match", ""):
+            return Response(status=304, headers=headers)
+        if entry.body is not None:
+            return Response(entry.body, mimetype=entry.mimetype, headers=headers)
+        fh = entry.path.open("rb")
+        headers["Content-Length"] = str(entry.size)
+        return Response(wrap_file(request.environ, fh), mimetype=entry.mimetype, headers=headers, direct_passthrough=True)
+
+
+STATIC = StaticFiles(BASE_DIR)
+
+
+@data_listener
+def _invalidate_static(store: "DataStore", name: str, old: Optional[Dict[str, Any]], new: Dict[str, Any]) -> None:
+    if old is not None:
+        STATIC.invalidate(store.data_dir / name)
+
+
+def _static_roots(filename: str) -> List[Path]:
+    root = _season().root
+    if root == STATIC.root:
+        return [root]
+    # Data never falls back to the shared root: that would serve the default season's
+    # data/ (or another season's directory) for a file this season lacks.
+    if Path(filename).parts[:1] == ("data",) or SEASONS.owner(root / filename):
+        return [root]
+    shared = STATIC.root / filename
+    if any(s.root != STATIC.root and (shared == s.root or s.root in shared.parents) for s in SEASONS.seasons.values()):
+        return [root]
+    return [root, STATIC.root]
+
+
+@timed("send_file")
+def _send_static(filename: str):
+    return STATIC.serve(filename, _static_roots(filename))
+
+
+@app.route("/api/admin/profile", methods=["POST"])
+def api_admin_profile():
+    if not _require_auth():
+        return jsonify({"error": "unauthorized"}), 401
+
+    try:
+        seconds = float(request.args.get("seconds", "10"))
+        hz = float(request.args.get("hz", "100"))
+    except ValueError:
+        return jsonify({"error": "invalid_params"}), 400
+    if not 0 < seconds <= PROFILE_MAX_SECONDS:
+        return jsonify({"error": "invalid_params", "hint": f"seconds must be in (0, {PROFILE_MAX_SECONDS}]."}), 400
+
+    if not _PROFILE_LOCK.acquire(blocking=False):
+        return jsonify({"error": "profile_in_progress"}), 409
+    try:
+        profiler = SamplingProfiler(
+            hz=hz, exclude={threading.get_ident()}, include_idle=request.args.get("idle") == "1"
+        ).start(seconds)
+        time.sleep(seconds)
+        return Response(profiler.stop(), mimetype="text/plain")
+    finally:
+        _PROFILE_LOCK.release()
+
+
+@app.route("/api/admin/profile/<profile_id>", methods=["GET"])
+def api_admin_profile_result(profile_id: str):
+    if not _require_auth():
+        return jsonify({"error": "unauthorized"}), 401
+
+    for stored_id, collapsed in _REQUEST_PROFILES:
+        if stored_id == profile_id:
+            return Response(collapsed, mimetype="text/plain")
+    return jsonify({"error": "not_found"}), 404
 
 
 @app.route("/")
 def index():
-    return send_from_directory(BASE_DIR, "index.html")
+    return _send_static("index.html")
 
 
 @app.route("/admin")
 def admin_redirect():
-    return send_from_directory(BASE_DIR, "admin.html")
+    return _send_static("admin.html")
 
 
 @app.route("/<path:path>")
 def static_files(path: str):
-    return send_from_directory(BASE_DIR, path)
+    parts = Path(path).parts
+    if parts and (parts[-1] == JOURNAL_NAME or HISTORY_DIR_NAME in parts):
+        return jsonify({"error": "not_found"}), 404
+    return _send_static(path)
+
+
+# Under the debug reloader only the child process (WERKZEUG_RUN_MAIN=true) serves requests;
+# simulation workers (which import this module) serve none.
+if FOLLOW_URL and multiprocessing.parent_process() is None and (
+    __name__ != "__main__" or os.environ.get("WERKZEUG_RUN_MAIN") == "true"
+):
+    for season in SEASONS.seasons.values():
+        _start_follower(season.store, FOLLOW_URL + season.prefix)
 
 
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=8000, debug=True)
\ No newline at end of file
+    app.run(host="0.0.0.0", port=8000, debug=True)
@@ -0,0 +1,68 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from league import storage  # noqa: E402
+
+
+def _doc(*ids, score="0-0"):
+    return {"matches": [{"id": match_id, "score": score} for match_id in ids]}
+
+
+def _log(*docs):
+    """A ChangeLog fed ``docs`` in order as seq 1, 2, ...; returns it and the last doc."""
+    log = storage.ChangeLog(0)
+    previous = None
+    for seq, doc in enumerate(docs, start=1):
+        log.record("matches.json", previous, doc, seq)
+        previous = doc
+    return log, {"matches.json": previous}
+
+
+def test_since_splits_added_modified_and_deleted():
+    log, docs = _log(_doc("a", "b"), _doc("a", "b", "c"), _doc("a", "c", score="1-0"))
+    changes = log.since(1, docs)["matches"]
+    assert [m["id"] for m in changes["added"]] == ["c"]
+    assert [m["id"] for m in changes["modified"]] == ["a"]
+    assert changes["deleted"] == ["b"]
+    # A client that already has "c" gets it as a modification.
+    changes = log.since(2, docs)["matches"]
+    assert sorted(m["id"] for m in changes["modified"]) == ["a", "c"]
+    assert changes["added"] == [] and changes["deleted"] == ["b"]
+    assert log.since(3, docs) == {}
+
+
+def test_readded_item_is_modified_for_clients_that_still_hold_it():
+    # seq 1: a, b   2: a changes   3: b deleted   4: nothing   5: b re-added
+    log, docs = _log(_doc("a", "b"), {"matches": [{"id": "a", "score": "1-0"}, {"id": "b", "score": "0-0"}]},
+                     {"matches": [{"id": "a", "score": "1-0"}]}, {"matches": [{"id": "a", "score": "1-0"}]},
+                     {"matches": [{"id": "a", "score": "1-0"}, {"id": "b", "score": "2-0"}]})
+    before_delete = log.since(2, docs)["matches"]
+    assert before_delete["added"] == [] and [m["id"] for m in before_delete["modified"]] == ["b"]
+    after_delete = log.since(3, docs)["matches"]
+    assert [m["id"] for m in after_delete["added"]] == ["b"] and after_delete["modified"] == []
+
+
+def test_readd_then_delete_is_not_reported_to_clients_that_missed_it():
+    log, docs = _log(_doc("a", "b"), _doc("a"), _doc("a", "b"), _doc("a"))
+    assert log.since(2, docs)["matches"]["deleted"] == []
+    assert log.since(1, docs)["matches"]["deleted"] == ["b"]
+
+
+def test_trim_raises_the_floor_and_drops_old_entries():
+    log, docs = _log(_doc("a"), _doc("a", "b"), _doc("a", "b", "c"))
+    log.trim(2)
+    assert log.floor == 2
+    assert list(log._entries) == [("matches.json", "matches", "c")]
+    assert [m["id"] for m in log.since(2, docs)["matches"]["added"]] == ["c"]
+
+
+def test_journal_compaction_trims_the_change_log(tmp_path):
+    store = storage.DataStore(tmp_path)
+    store.history.keep = 3
+    store.read("matches.json")
+    for i in range(8):
+        store.commit({"matches.json": _doc(*(f"m{j}" for j in range(i + 1)))})
+    assert store.changes.floor == store.first_seq - 1
+    assert all(changed > store.changes.floor for _, changed, _, _ in store.changes._entries.values())
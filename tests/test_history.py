@@ -0,0 +1,78 @@
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import server  # noqa: E402
+from league import storage  # noqa: E402
+
+
+def _matches(*scores):
+    return {"matches": [{"id": f"m{i}", "score": score} for i, score in enumerate(scores)]}
+
+
+def test_unchanged_payload_is_not_a_new_version(tmp_path):
+    history = storage.History(tmp_path / ".history")
+    assert history.record("matches.json", _matches("0-0", "1-0"), 1) == 1
+    assert history.record("matches.json", _matches("0-0", "1-0"), 2) == 1
+    assert history.record("matches.json", _matches("0-0", "2-0"), 3) == 2
+    # The unchanged match is stored once and shared by both versions.
+    assert len(list((tmp_path / ".history" / "objects").glob("*.gz"))) == 4
+    assert [v["version"] for v in history.list("matches.json")] == [2, 1]
+
+
+def test_first_write_can_be_rolled_back(tmp_path):
+    original = _matches("0-0", "1-0")
+    (tmp_path / "matches.json").write_text(json.dumps(original), encoding="utf-8")
+    store = storage.DataStore(tmp_path)
+
+    store.commit({"matches.json": _matches("bad", "1-0")})
+
+    versions = store.history.list("matches.json")
+    assert [v["version"] for v in versions] == [2, 1]
+    assert store.history.load("matches.json", 1) == original
+    store.rollback("matches.json", 1)
+    assert json.loads((tmp_path / "matches.json").read_text(encoding="utf-8")) == original
+    assert store.read("matches.json") == original
+    assert store.history.current("matches.json") == 1
+
+
+def test_first_external_edit_keeps_the_content_it_replaced(tmp_path):
+    path = tmp_path / "matches.json"
+    path.write_text(json.dumps(_matches("0-0")), encoding="utf-8")
+    store = storage.DataStore(tmp_path)
+    assert store.read("matches.json") == _matches("0-0")
+
+    # Edited outside the server (editor.py over SFTP).
+    path.write_text(json.dumps(_matches("9-9")) + "\n", encoding="utf-8")
+    assert store.read("matches.json") == _matches("9-9")
+    assert store.history.load("matches.json", 1) == _matches("0-0")
+    assert store.history.load("matches.json", 2) == _matches("9-9")
+    assert store.seq == 1
+
+
+def test_prune_keeps_the_newest_versions_and_gc_drops_their_objects(tmp_path):
+    history = storage.History(tmp_path / ".history", keep=3, gc_every=4)
+    for i in range(6):
+        history.record("matches.json", _matches(f"{i}-0"), i + 1)
+    assert [v["version"] for v in history.list("matches.json")] == [6, 5, 4]
+    # Three versions pruned so far: below gc_every, so their objects are still on disk.
+    objects = tmp_path / ".history" / "objects"
+    assert len(list(objects.glob("*.gz"))) == 7
+
+    history.record("matches.json", _matches("6-0"), 7)
+    # The fourth prune triggers a sweep: one shared shell plus the three live matches remain.
+    assert len(list(objects.glob("*.gz"))) == 4
+    assert history.load("matches.json", 5) == _matches("4-0")
+    assert history.gc() == 0
+
+
+def test_history_endpoint_lists_the_original_and_rejects_a_non_numeric_version(tmp_path, monkeypatch):
+    (tmp_path / "matches.json").write_text(json.dumps(_matches("0-0")), encoding="utf-8")
+    monkeypatch.setattr(server.SEASONS.get(""), "store", storage.DataStore(tmp_path))
+    client = server.app.test_client()
+    headers = {"X-Admin-Token": server.ADMIN_TOKEN}
+    assert [v["version"] for v in client.get("/api/history", headers=headers).get_json()["versions"]] == [1]
+    assert client.get("/api/history?version=abc", headers=headers).status_code == 400
+    assert client.get("/api/history?version=999999", headers=headers).status_code == 404
@@ -0,0 +1,46 @@
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from league import storage  # noqa: E402
+
+
+def test_torn_tail_is_truncated_before_next_append(tmp_path):
+    store = storage.DataStore(tmp_path)
+    assert store.commit({"teams.json": {"teams": {"a": {"name": "A"}}}}) == 1
+
+    # Crash mid-append: a partial line with no trailing newline.
+    with store.journal_path.open("ab") as fh:
+        fh.write(b'{"seq": 2, "ts": 0, "files": {"teams.json"')
+
+    assert store.commit({"teams.json": {"teams": {"b": {"name": "B"}}}}) == 2
+
+    restarted = storage.DataStore(tmp_path)
+    assert restarted.seq == 2
+    assert [seq for seq, _ in restarted._offsets] == [1, 2]
+    entries = restarted.entries_since(0)
+    assert [e["seq"] for e in entries] == [1, 2]
+    assert entries[-1]["files"]["teams.json"]["teams"] == {"b": {"name": "B"}}
+    for line in store.journal_path.read_bytes().splitlines():
+        json.loads(line)
+
+
+def test_journal_is_trimmed_to_history_retention(tmp_path):
+    store = storage.DataStore(tmp_path)
+    store.history.keep = 5
+    for i in range(23):
+        store.commit({"teams.json": {"teams": {str(i): {"name": str(i)}}}})
+
+    lines = store.journal_path.read_bytes().splitlines()
+    assert len(lines) <= 10
+    assert json.loads(lines[-1])["seq"] == 23
+
+    restarted = storage.DataStore(tmp_path)
+    assert restarted.seq == 23
+    assert restarted.first_seq == json.loads(lines[0])["seq"]
+    assert [e["seq"] for e in restarted.entries_since(20)] == [21, 22, 23]
+    # A replica behind the cut resyncs from one full entry.
+    behind = restarted.entries_since(1)
+    assert len(behind) == 1 and behind[0]["full"] and behind[0]["seq"] == 23
@@ -0,0 +1,95 @@
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from league import storage  # noqa: E402
+
+
+def _submit_all(calls, gap=0.02):
+    """Run each call on its own thread, started ``gap`` apart; returns results (or raised errors)."""
+    results = [None] * len(calls)
+
+    def run(i, call):
+        try:
+            results[i] = call()
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=run, args=(i, call)) for i, call in enumerate(calls)]
+    for thread in threads:
+        thread.start()
+        time.sleep(gap)
+    for thread in threads:
+        thread.join(5)
+    return results
+
+
+def _journal(store):
+    return [json.loads(line) for line in store.journal_path.read_bytes().splitlines()]
+
+
+def test_concurrent_submits_share_one_journal_entry(tmp_path):
+    writer = storage.CommitQueue(window=0.5)
+    store = storage.DataStore(tmp_path)
+    seqs = _submit_all([
+        lambda: writer.submit(store, "teams.json", {"teams": {"a": {"name": "A"}}}),
+        lambda: writer.submit(store, "matches.json", {"matches": [{"id": "m1"}]}),
+        lambda: writer.submit(store, "matches.json", {"matches": [{"id": "m2"}]}),
+    ])
+    assert seqs == [1, 1, 1]
+    entries = _journal(store)
+    assert len(entries) == 1
+    # The later update of the same file wins.
+    assert entries[0]["files"]["matches.json"] == {"matches": [{"id": "m2"}]}
+    assert writer.stats["coalesced"] == 1
+
+
+def test_writes_queued_before_a_rollback_commit_first(tmp_path):
+    writer = storage.CommitQueue(window=0.5)
+    store = storage.DataStore(tmp_path)
+    store.commit({"matches.json": {"matches": [{"id": "v1"}]}})
+    seqs = _submit_all([
+        lambda: writer.submit(store, "matches.json", {"matches": [{"id": "before"}]}),
+        lambda: writer.submit_rollback(store, "matches.json", 1),
+        lambda: writer.submit(store, "matches.json", {"matches": [{"id": "after"}]}),
+    ])
+    assert seqs == [2, 3, 4]
+    assert [e["files"]["matches.json"]["matches"][0]["id"] for e in _journal(store)] == ["v1", "before", "v1", "after"]
+    assert store.read("matches.json") == {"matches": [{"id": "after"}]}
+
+
+def test_failed_commit_raises_in_every_waiter(tmp_path, monkeypatch):
+    writer = storage.CommitQueue(window=0.5)
+    store = storage.DataStore(tmp_path)
+
+    def fail(files):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(store, "commit", fail)
+    results = _submit_all([
+        lambda: writer.submit(store, "teams.json", {"teams": {}}),
+        lambda: writer.submit(store, "matches.json", {"matches": []}),
+    ])
+    assert all(isinstance(result, OSError) for result in results)
+
+    # The writer thread survives the failure.
+    monkeypatch.undo()
+    assert writer.submit(store, "teams.json", {"teams": {}}) == 1
+
+
+def test_crashed_batch_releases_its_waiters(tmp_path, monkeypatch):
+    writer = storage.CommitQueue(window=0.2)
+    store = storage.DataStore(tmp_path)
+
+    def crash(batch):
+        raise RuntimeError("writer bug")
+
+    monkeypatch.setattr(writer, "_process", crash)
+    with pytest.raises(RuntimeError):
+        writer.submit(store, "teams.json", {"teams": {}})